@@ -4,10 +4,13 @@ Demo script that works with Cursor IDE's browser.
 Uses Cursor browser for navigation and provides extraction results.
 """
 
-print("=" * 80)
-print("DUCATI SCRAPER - Cursor Browser Integration")
-print("=" * 80)
-print("""
+
+def main():
+    """Print the Cursor browser integration walkthrough."""
+    print("=" * 80)
+    print("DUCATI SCRAPER - Cursor Browser Integration")
+    print("=" * 80)
+    print("""
 This script is designed to work with Cursor IDE's built-in browser.
 
 HOW IT WORKS:
@@ -20,10 +23,10 @@ The page is already loaded in Cursor's browser!
 Now I'll demonstrate the extraction process...
 """)
 
-print("\n" + "=" * 80)
-print("EXTRACTION DEMONSTRATION")
-print("=" * 80)
-print("""
+    print("\n" + "=" * 80)
+    print("EXTRACTION DEMONSTRATION")
+    print("=" * 80)
+    print("""
 Since Cursor's browser has successfully loaded the page, I can now:
 
 1. ✅ Navigate to pages (already done)
@@ -46,3 +49,5 @@ Ready to proceed with extraction!
 """)
 
 
+if __name__ == "__main__":
+    main()
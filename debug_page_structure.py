@@ -4,9 +4,85 @@ Debug script to inspect page structure and find working selectors.
 """
 
 import asyncio
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from pathlib import Path
 
+# Collects text/href/visibility for the first `limit` matches in one round-trip
+PROBE_JS = """(elements, limit) => ({
+    count: elements.length,
+    hits: elements.slice(0, limit).map(e => ({
+        text: (e.innerText || '').slice(0, 50),
+        href: e.getAttribute('href'),
+        visible: e.getClientRects().length > 0 && getComputedStyle(e).visibility !== 'hidden',
+    })),
+})"""
+
+LINKS_JS = """() => [...document.querySelectorAll('a[href]')].map(a => ({
+    href: a.getAttribute('href'),
+    text: (a.innerText || '').slice(0, 50),
+}))"""
+
+
+async def probe_selectors(page, selectors, limit=5):
+    """
+    Probe several selectors concurrently, one evaluate call per selector.
+
+    Uses locators so Playwright-only selectors (e.g. :has-text) still work.
+
+    Returns:
+        List of (selector, result) pairs; result is an exception on failure
+    """
+    results = await asyncio.gather(
+        *(page.locator(selector).evaluate_all(PROBE_JS, limit) for selector in selectors),
+        return_exceptions=True
+    )
+    return list(zip(selectors, results))
+
+
+async def probe_url(context, url):
+    """
+    Load one candidate URL on its own page.
+
+    Returns:
+        (page, ok, html) - page is None if navigation failed, ok is False on
+        Access Denied, html is the page HTML if it had to be fetched
+    """
+    page = await context.new_page()
+    lines = [f"\nTrying: {url}"]
+    try:
+        response = await page.goto(url, wait_until='domcontentloaded', timeout=15000)
+        lines.append(f"  Status: {response.status if response else 'None'}")
+        try:
+            await page.wait_for_selector('h1, main, nav', timeout=5000)
+        except PlaywrightTimeoutError:
+            pass
+        
+        title = await page.title()
+        lines.append(f"  Title: {title}")
+        lines.append(f"  Final URL: {page.url}")
+        
+        # Check if we got access denied; only pull the HTML if the title is inconclusive
+        html = None
+        if "Access Denied" not in title:
+            html = await page.content()
+        if html is None or "access denied" in html.lower():
+            lines.append(f"  ❌ Access Denied on {url}")
+            return page, False, html
+        lines.append(f"  ✅ Successfully loaded {url}")
+        return page, True, html
+    except asyncio.CancelledError:
+        lines.append("  Cancelled (another URL loaded first)")
+        await page.close()
+        raise
+    except Exception as e:
+        lines.append(f"  Error: {e}")
+        await page.close()
+        return None, False, None
+    finally:
+        # Print each probe as one block so concurrent output doesn't interleave
+        print("\n".join(lines))
+
+
 async def debug_page():
     """Inspect the Ducati homepage structure."""
     async with async_playwright() as p:
@@ -25,8 +101,6 @@ async def debug_page():
                 'Upgrade-Insecure-Requests': '1',
             }
         )
-        page = await context.new_page()
-        
         print("Navigating to https://www.ducati.com...")
         # Try different URLs
         urls_to_try = [
@@ -36,28 +110,30 @@ async def debug_page():
             "https://www.ducati.com/ww/en/home",
         ]
         
-        for url in urls_to_try:
-            print(f"\nTrying: {url}")
-            try:
-                response = await page.goto(url, wait_until='networkidle', timeout=30000)
-                print(f"  Status: {response.status if response else 'None'}")
-                await page.wait_for_timeout(3000)
-                
-                title = await page.title()
-                current_url = page.url
-                print(f"  Title: {title}")
-                print(f"  Final URL: {current_url}")
-                
-                # Check if we got access denied
-                if "Access Denied" in title or "access denied" in (await page.content()).lower():
-                    print(f"  ❌ Access Denied on {url}")
-                    continue
-                else:
-                    print(f"  ✅ Successfully loaded {url}")
-                    break
-            except Exception as e:
-                print(f"  Error: {e}")
-                continue
+        # Probe all candidates at once; the first one that loads wins
+        tasks = [asyncio.create_task(probe_url(context, url)) for url in urls_to_try]
+        page = None
+        probed_pages = []
+        for next_done in asyncio.as_completed(tasks):
+            candidate, ok, _ = await next_done
+            if candidate:
+                probed_pages.append(candidate)
+            if ok:
+                page = candidate
+                break
+        
+        for task in tasks:
+            task.cancel()
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, tuple) and result[0] and result[0] not in probed_pages:
+                probed_pages.append(result[0])
+        
+        # Fall back to the last page that loaded at all (e.g. an Access Denied page)
+        if page is None:
+            page = probed_pages[-1] if probed_pages else await context.new_page()
+        for other in probed_pages:
+            if other is not page:
+                await other.close()
         
         # Take screenshot
         screenshot_path = Path("debug_screenshot.png")
@@ -98,20 +174,13 @@ async def debug_page():
             '[id*="model"]',
             'nav a',
         ]
-        for selector in models_selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                print(f"  {selector}: Found {len(elements)} elements")
-                for i, elem in enumerate(elements[:5]):  # Show first 5
-                    try:
-                        text = await elem.inner_text()
-                        href = await elem.get_attribute('href')
-                        visible = await elem.is_visible()
-                        print(f"    [{i}] text='{text[:50]}' href='{href}' visible={visible}")
-                    except:
-                        pass
-            except Exception as e:
-                print(f"  Error with {selector}: {e}")
+        for selector, result in await probe_selectors(page, models_selectors, limit=5):  # Show first 5
+            if isinstance(result, Exception):
+                print(f"  Error with {selector}: {result}")
+                continue
+            print(f"  {selector}: Found {result['count']} elements")
+            for i, hit in enumerate(result['hits']):
+                print(f"    [{i}] text='{hit['text']}' href='{hit['href']}' visible={hit['visible']}")
         
         # Check for search button
         print("\n=== Checking for search button ===")
@@ -122,36 +191,27 @@ async def debug_page():
             '[class*="search"] button',
             '[id*="search"]',
         ]
-        for selector in search_selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                print(f"  {selector}: Found {len(elements)} elements")
-                for i, elem in enumerate(elements[:3]):
-                    try:
-                        text = await elem.inner_text()
-                        visible = await elem.is_visible()
-                        print(f"    [{i}] text='{text[:50]}' visible={visible}")
-                    except:
-                        pass
-            except Exception as e:
-                print(f"  Error with {selector}: {e}")
+        for selector, result in await probe_selectors(page, search_selectors, limit=3):
+            if isinstance(result, Exception):
+                print(f"  Error with {selector}: {result}")
+                continue
+            print(f"  {selector}: Found {result['count']} elements")
+            for i, hit in enumerate(result['hits']):
+                print(f"    [{i}] text='{hit['text']}' visible={hit['visible']}")
         
         # Extract all links
         print("\n=== Extracting all links ===")
-        links = await page.query_selector_all('a[href]')
+        # One round-trip for every anchor's href and text
+        links = await page.evaluate(LINKS_JS)
         print(f"Found {len(links)} total links")
         
         # Filter for bike-related links
         bike_keywords = ['bike', 'model', 'heritage', 'motorcycle']
-        bike_links = []
-        for link in links:
-            try:
-                href = await link.get_attribute('href')
-                text = await elem.inner_text() if (elem := link) else ""
-                if href and any(kw in href.lower() for kw in bike_keywords):
-                    bike_links.append((href, text[:50]))
-            except:
-                continue
+        bike_links = [
+            (link['href'], link['text'])
+            for link in links
+            if link['href'] and any(kw in link['href'].lower() for kw in bike_keywords)
+        ]
         
         print(f"\nFound {len(bike_links)} bike-related links:")
         for href, text in bike_links[:20]:  # Show first 20
@@ -162,7 +222,8 @@ async def debug_page():
         print(f"Title: {await page.title()}")
         print(f"URL: {page.url}")
         
-        # Get page HTML snippet
+        # Get page HTML snippet; read again so it reflects the cookie click
+        # and probes above rather than the HTML captured at navigation
         print("\n=== Page HTML snippet (first 2000 chars) ===")
         html = await page.content()
         print(html[:2000])
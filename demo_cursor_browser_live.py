@@ -4,10 +4,13 @@ Live demo using Cursor IDE's browser MCP tools.
 This script demonstrates scraping using Cursor's built-in browser.
 """
 
-print("=" * 80)
-print("DUCATI SCRAPER DEMO - Using Cursor Browser")
-print("=" * 80)
-print("""
+
+def main():
+    """Print the live demo introduction."""
+    print("=" * 80)
+    print("DUCATI SCRAPER DEMO - Using Cursor Browser")
+    print("=" * 80)
+    print("""
 This demo uses Cursor IDE's built-in browser MCP tools.
 
 The scraping will be performed through Cursor's browser interface.
@@ -17,3 +20,5 @@ The browser is now open and ready for scraping!
 """)
 
 
+if __name__ == "__main__":
+    main()
@@ -5,198 +5,443 @@ Shows the scraping process in real-time.
 """
 
 import asyncio
+import os
 import sys
+import traceback
+from itertools import islice
 from pathlib import Path
+from typing import Dict, List, Optional
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from src.extractors.data_extractor import DataExtractor
 from src.extractors.image_extractor import ImageExtractor
+from src.utils.consent_state import STATE_FILE, state_is_fresh
 from src.utils.cookie_handler import CookieHandler
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# First content node the extractors need; networkidle never settles on
+# pages with analytics/long-polling traffic
+CONTENT_SELECTOR = 'main, [data-testid="spec-list"], .bike-hero'
 
-async def demo_scrape_page(url: str):
-    """Demo scraping a single page with visible browser."""
+# Consent banner (OneTrust) that must be gone before accordions/carousels
+# are clicked
+COOKIE_BANNER_SELECTOR = '#onetrust-banner-sdk'
+
+# Tabs scraped at once in one shared browser context
+MAX_PARALLEL_PAGES = 3
+
+# CDP WebSocket URL of an already running Chromium
+# (e.g. ws://127.0.0.1:9222/devtools/browser/<id>); when set, every scraper
+# process attaches to that browser instead of launching its own
+CDP_ENDPOINT_ENV = 'CDP_ENDPOINT'
+
+# Full HD keeps the desktop layout and lazy-load triggers the image harvest
+# relies on; data-only runs render nothing for screenshots or sizes, so a
+# smaller framebuffer is enough
+IMAGE_VIEWPORT = {'width': 1920, 'height': 1080}
+DATA_ONLY_VIEWPORT = {'width': 1024, 'height': 768}
+
+# Chromium flags that cut per-page memory for headless scraping; the V8 heap
+# cap turns runaway pages into a renderer crash instead of a host OOM
+BROWSER_LAUNCH_ARGS = [
+    '--no-zygote',
+    '--disable-gpu',
+    '--disable-dev-shm-usage',
+    '--disable-accelerated-2d-canvas',
+    '--disable-mipmap-generation',
+    '--disable-partial-raster',
+    '--disable-background-networking',
+    '--disable-extensions',
+    '--disable-sync',
+    '--mute-audio',
+    '--no-first-run',
+    '--js-flags=--max-old-space-size=512',
+]
+
+# Pages served by one browser context before it is replaced; Chromium only
+# gives back a context's memory once the context is closed
+CONTEXT_RECYCLE_PAGES = 25
+
+# URL patterns never needed for extraction. Blocked through a CDP session
+# (Network.setBlockedURLs) since page.route() handlers leak in long runs.
+# Trailing * also matches Contentful's ?w=...&fm=... query strings.
+BLOCKED_URL_PATTERNS = [
+    '*.woff*', '*.woff2*', '*.ttf*', '*.otf*',
+    '*.mp4*', '*.webm*', '*.m3u8*',
+]
+# Data-only runs skip the image harvest, so image bytes and stylesheets can
+# go too; the harvest keeps them because lazy loading and the size filter
+# depend on rendered layout
+DATA_ONLY_BLOCKED_URL_PATTERNS = BLOCKED_URL_PATTERNS + [
+    '*.jpg*', '*.jpeg*', '*.png*', '*.gif*', '*.webp*', '*.avif*', '*.svg*',
+    '*.css*',
+]
+
+
+async def get_shared_browser(p, data_only: bool = False):
+    """
+    Get the one browser all scrape tasks of this run share.
+    
+    Args:
+        p: Started Playwright instance
+        data_only: Launch with image rendering disabled
+    
+    Returns:
+        Browser connected over CDP when CDP_ENDPOINT is set, otherwise a
+        newly launched headless Chromium. Closing a CDP-connected browser
+        only disconnects from it.
+    """
+    endpoint = os.environ.get(CDP_ENDPOINT_ENV)
+    if endpoint:
+        logger.info(f"Connecting to shared browser at {endpoint}")
+        return await p.chromium.connect_over_cdp(endpoint)
+    args = list(BROWSER_LAUNCH_ARGS)
+    if data_only:
+        args.append('--blink-settings=imagesEnabled=false')
+    # Launch browser in headless mode (console-based)
+    return await p.chromium.launch(
+        headless=True,  # Headless browser (console-based)
+        args=args,
+    )
+
+
+async def block_heavy_resources(page, data_only: bool = False):
+    """
+    Block font/media downloads (plus images and CSS when data_only) for a page.
+    
+    Args:
+        page: Playwright page, before navigation
+        data_only: Whether images and stylesheets are unused as well
+    """
+    patterns = DATA_ONLY_BLOCKED_URL_PATTERNS if data_only else BLOCKED_URL_PATTERNS
+    client = await page.context.new_cdp_session(page)
+    await client.send('Network.enable')
+    await client.send('Network.setBlockedURLs', {'urls': patterns})
+
+
+class ContextPool:
+    """
+    Hands out a browser context that is recycled every max_pages pages.
+    
+    Cookies and local storage are carried over to the replacement context,
+    and a retired context is only closed once its last page is released.
+    """
+    
+    def __init__(
+        self,
+        browser,
+        max_pages: int = CONTEXT_RECYCLE_PAGES,
+        storage_state: Optional[str] = None,
+        **context_options
+    ):
+        """
+        Initialize context pool.
+        
+        Args:
+            browser: Browser to create contexts in
+            max_pages: Pages served by a context before it is replaced
+            storage_state: Saved state file to start the first context from
+            **context_options: Keyword arguments for browser.new_context()
+        """
+        self.browser = browser
+        self.max_pages = max_pages
+        self.storage_state = storage_state
+        self.context_options = context_options
+        self._context = None
+        self._pages_served = 0
+        # Open pages per live context, current and retired
+        self._active: Dict = {}
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """
+        Get the context to open the next page in.
+        
+        Returns:
+            Browser context; pass it back to release() when the page is closed
+        """
+        async with self._lock:
+            if self._context is None or self._pages_served >= self.max_pages:
+                retired = self._context
+                storage_state = await retired.storage_state() if retired else self.storage_state
+                self._context = await self.browser.new_context(
+                    storage_state=storage_state, **self.context_options
+                )
+                self._active[self._context] = 0
+                self._pages_served = 0
+                if retired is not None:
+                    logger.debug("Recycling browser context")
+                    await self._close_if_idle(retired)
+            self._pages_served += 1
+            self._active[self._context] += 1
+            return self._context
+    
+    async def release(self, context):
+        """Mark a page of context as closed."""
+        self._active[context] -= 1
+        if context is not self._context:
+            await self._close_if_idle(context)
+    
+    async def close(self):
+        """Close every context of the pool."""
+        for context in list(self._active):
+            await context.close()
+        self._active.clear()
+        self._context = None
+    
+    async def _close_if_idle(self, context):
+        """Close a retired context that has no open pages left."""
+        if self._active.get(context) == 0:
+            del self._active[context]
+            await context.close()
+
+
+async def demo_scrape_pages(urls: List[str], data_only: bool = False):
+    """
+    Demo scraping several pages in parallel with one browser.
+    
+    Args:
+        urls: Page URLs to scrape
+        data_only: Extract text data only, skipping images and their downloads
+    """
     
     print("=" * 80)
     print("DUCATI SCRAPER DEMO - Console Mode")
     print("=" * 80)
-    print(f"\n🎯 Scraping: {url}")
+    for url in urls:
+        print(f"\n🎯 Scraping: {url}")
     print("\nRunning in headless mode with detailed console output...")
     print("Watch the scraping process step-by-step in the console!\n")
     
     async with async_playwright() as p:
-        # Launch browser in headless mode (console-based)
-        browser = await p.chromium.launch(
-            headless=True,  # Headless browser (console-based)
-        )
+        browser = await get_shared_browser(p, data_only)
         
-        context = await browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
+        state_restored = state_is_fresh()
+        pool = ContextPool(
+            browser,
+            storage_state=str(STATE_FILE) if state_restored else None,
+            viewport=DATA_ONLY_VIEWPORT if data_only else IMAGE_VIEWPORT,
             user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         )
         
-        page = await context.new_page()
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_PAGES)
+        # Set by the first page that accepts the cookie banner; the consent
+        # cookie is kept by the pool's contexts so the other pages skip the banner
+        cookies_accepted = asyncio.Event()
+        if state_restored:
+            print(f"♻️  Reusing saved consent state: {STATE_FILE}\n")
+            cookies_accepted.set()
+        
+        async def scrape_one(url: str):
+            async with semaphore:
+                await demo_scrape_page(pool, url, cookies_accepted, data_only)
         
         try:
-            # Navigate to page
-            print(f"📍 Navigating to {url}...")
-            print("   (This may take a moment...)")
-            response = await page.goto(url, wait_until='networkidle', timeout=60000)
-            if response:
-                print(f"   ✓ Page loaded: {response.status} {response.status_text}")
-            await asyncio.sleep(2)
-            
-            # Get page title
-            title = await page.title()
-            print(f"   ✓ Page title: {title}")
-            
-            # Handle cookies
-            print("\n🍪 Handling cookies...")
+            await asyncio.gather(*(scrape_one(url) for url in urls))
+        finally:
+            await pool.close()
+            await browser.close()
+            print("\n🔒 Browser closed.")
+
+
+async def demo_scrape_page(
+    pool: ContextPool, url: str, cookies_accepted: asyncio.Event, data_only: bool = False
+):
+    """
+    Demo scraping a single page on its own tab of a pooled context.
+    
+    The page's report is buffered and written in one go when the page is
+    done, so reports of pages scraped in parallel do not interleave.
+    """
+    logger.info(f"Scraping {url}")
+    out = [f"\n{'=' * 80}", f"🎯 {url}", "=" * 80]
+    context = await pool.acquire()
+    page = await context.new_page()
+    
+    try:
+        await block_heavy_resources(page, data_only)
+        
+        # Navigate to page
+        out.append(f"📍 Navigating to {url}...")
+        out.append("   (This may take a moment...)")
+        response = await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+        if response:
+            out.append(f"   ✓ Page loaded: {response.status} {response.status_text}")
+        # Wait for the first real content node instead of network idle
+        try:
+            await page.wait_for_selector(CONTENT_SELECTOR, timeout=15000)
+        except PlaywrightTimeoutError:
+            logger.debug(f"Content selector '{CONTENT_SELECTOR}' not found, continuing")
+        
+        # Get page title
+        title = await page.title()
+        out.append(f"   ✓ Page title: {title}")
+        
+        # Handle cookies
+        out.append("\n🍪 Handling cookies...")
+        if cookies_accepted.is_set():
+            out.append("   ✓ Cookies already accepted")
+        else:
             cookie_handler = CookieHandler(page)
-            cookies_accepted = await cookie_handler.accept_cookies()
-            if cookies_accepted:
-                print("   ✓ Cookies accepted")
+            if await cookie_handler.accept_cookies(wait_after=0):
+                cookies_accepted.set()
+                out.append("   ✓ Cookies accepted")
+                # Wait for the banner to go away instead of a fixed sleep
+                try:
+                    await page.wait_for_selector(COOKIE_BANNER_SELECTOR, state='hidden', timeout=3000)
+                except PlaywrightTimeoutError:
+                    logger.debug("Cookie banner still visible after accepting")
+                # Save the consent cookie for later runs
+                try:
+                    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+                    await context.storage_state(path=str(STATE_FILE))
+                except Exception as e:
+                    logger.debug(f"Could not save consent state: {e}")
             else:
-                print("   ⚠ No cookie banner found")
-            await asyncio.sleep(1)
-            
-            # Extract data
-            print("\n📝 Extracting content...")
-            print("   - Expanding accordions...")
-            print("   - Navigating carousels...")
-            print("   - Extracting text content...")
-            
-            data_extractor = DataExtractor()
-            data = await data_extractor.extract_from_page(page, 'main')
-            
-            print(f"\n   ✓ Extracted {len(data.get('specifications', {}))} specifications")
-            if data.get('specifications'):
-                print("   Sample specs:")
-                for i, (key, value) in enumerate(list(data['specifications'].items())[:5], 1):
-                    print(f"     {i}. {key}: {value[:60]}...")
-            
-            print(f"   ✓ Extracted {len(data.get('features', []))} features")
-            if data.get('features'):
-                print("   Sample features:")
-                for i, feature in enumerate(data['features'][:3], 1):
-                    print(f"     {i}. {feature[:60]}...")
-            
-            desc = data.get('description', '')
-            print(f"   ✓ Description length: {len(desc)} chars")
-            
-            if data.get('content_sections'):
-                sections = data['content_sections']
-                print(f"   ✓ Content sections found: {list(sections.keys())}")
-                for key, value in sections.items():
-                    if value and isinstance(value, str):
-                        print(f"     • {key}: {len(value)} chars")
-            
-            # Extract images
-            print("\n🖼️  Extracting images...")
-            print("   - Finding all image elements...")
-            print("   - Expanding accordions to reveal hidden images...")
-            print("   - Navigating carousels to get all images...")
-            print("   - Extracting from picture elements...")
-            print("   - Extracting video posters...")
-            print("   - Extracting background images...")
+                out.append("   ⚠ No cookie banner found")
+        
+        # Extract data
+        out.append("\n📝 Extracting content...")
+        out.append("   - Expanding accordions...")
+        out.append("   - Navigating carousels...")
+        out.append("   - Extracting text content...")
+        
+        data_extractor = DataExtractor()
+        data = await data_extractor.extract_from_page(page, 'main')
+        
+        out.append(f"\n   ✓ Extracted {len(data.get('specifications', {}))} specifications")
+        if data.get('specifications'):
+            out.append("   Sample specs:")
+            out.extend(
+                f"     {i}. {key}: {value[:60]}..."
+                for i, (key, value) in enumerate(islice(data['specifications'].items(), 5), 1)
+            )
+        
+        out.append(f"   ✓ Extracted {len(data.get('features', []))} features")
+        if data.get('features'):
+            out.append("   Sample features:")
+            out.extend(f"     {i}. {feature[:60]}..." for i, feature in enumerate(islice(data['features'], 3), 1))
+        
+        desc = data.get('description', '')
+        out.append(f"   ✓ Description length: {len(desc)} chars")
+        
+        if data.get('content_sections'):
+            sections = data['content_sections']
+            out.append(f"   ✓ Content sections found: {list(sections.keys())}")
+            for key, value in sections.items():
+                if value and isinstance(value, str):
+                    out.append(f"     • {key}: {len(value)} chars")
+        
+        # Extract images
+        images = []
+        if data_only:
+            out.append("\n🖼️  Skipping images (data-only mode)")
+        else:
+            out.append("\n🖼️  Extracting images...")
+            out.append("   - Finding all image elements...")
+            out.append("   - Expanding accordions to reveal hidden images...")
+            out.append("   - Navigating carousels to get all images...")
+            out.append("   - Extracting from picture elements...")
+            out.append("   - Extracting video posters...")
+            out.append("   - Extracting background images...")
             
             image_extractor = ImageExtractor()
             
             # Get model name from URL for context
-            model = url.split('/')[-1] if '/' in url else 'unknown'
+            model = url.rstrip('/').rpartition('/')[2] or 'unknown'
             year = 2024  # Default year
             
             images = await image_extractor.extract_images(page, model, year)
-            print(f"\n   ✓ Found {len(images)} images")
-            
-            # Categorize images by type
-            if images:
-                image_types = {}
-                for img in images:
-                    img_type = img.get('type', 'unknown')
-                    image_types[img_type] = image_types.get(img_type, 0) + 1
-                
-                print("   Image breakdown:")
-                for img_type, count in image_types.items():
-                    print(f"     • {img_type}: {count}")
-                
-                print("\n   Sample images:")
-                for i, img in enumerate(images[:5], 1):
-                    img_type = img.get('type', 'unknown')
-                    url_short = img['url'][:70] + "..." if len(img['url']) > 70 else img['url']
-                    print(f"     {i}. [{img_type}] {url_short}")
-            
-            # Show extracted content preview
-            print("\n📄 Content Preview:")
-            print("-" * 80)
-            description = data.get('description', '')
-            if description:
-                preview = description[:500] + "..." if len(description) > 500 else description
-                print(preview)
-            
-            if data.get('content_sections'):
-                print("\n📋 Content Sections:")
-                for key, value in data['content_sections'].items():
-                    if value and isinstance(value, str):
-                        preview = value[:200] + "..." if len(value) > 200 else value
-                        print(f"   • {key}: {preview}")
-            
-            # Show full content preview
-            print("\n" + "=" * 80)
-            print("📄 FULL CONTENT PREVIEW")
-            print("=" * 80)
-            
-            description = data.get('description', '')
-            if description:
-                print("\nDescription:")
-                print("-" * 80)
-                # Show first 1000 chars
-                preview = description[:1000] + "\n..." if len(description) > 1000 else description
-                print(preview)
-            
-            if data.get('content_sections'):
-                print("\nContent Sections:")
-                print("-" * 80)
-                for key, value in data['content_sections'].items():
-                    if value:
-                        if isinstance(value, str):
-                            preview = value[:300] + "..." if len(value) > 300 else value
-                            print(f"\n{key.upper()}:")
-                            print(f"  {preview}")
-                        elif isinstance(value, dict):
-                            print(f"\n{key.upper()}:")
-                            for sub_key, sub_value in value.items():
-                                if isinstance(sub_value, str):
-                                    preview = sub_value[:200] + "..." if len(sub_value) > 200 else sub_value
-                                    print(f"  {sub_key}: {preview}")
+            out.append(f"\n   ✓ Found {len(images)} images")
+        
+        # Categorize images by type
+        if images:
+            image_types = {}
+            for img in images:
+                img_type = img.get('type', 'unknown')
+                image_types[img_type] = image_types.get(img_type, 0) + 1
             
-            print("\n" + "=" * 80)
-            print("✅ DEMO COMPLETE!")
-            print("=" * 80)
-            print(f"\nSummary:")
-            print(f"  • Specifications: {len(data.get('specifications', {}))}")
-            print(f"  • Features: {len(data.get('features', []))}")
-            print(f"  • Images: {len(images)}")
-            print(f"  • Description: {len(description)} characters")
-            print(f"  • Content sections: {len(data.get('content_sections', {}))}")
-            print("\nAll data extracted successfully! ✓\n")
+            out.append("   Image breakdown:")
+            out.extend(f"     • {img_type}: {count}" for img_type, count in image_types.items())
             
-        except Exception as e:
-            print(f"\n❌ Error: {e}")
-            import traceback
-            print("\nFull error traceback:")
-            print("-" * 80)
-            traceback.print_exc()
-            print("-" * 80)
-        finally:
-            await browser.close()
-            print("\n🔒 Browser closed.")
+            out.append("\n   Sample images:")
+            for i, img in enumerate(images[:5], 1):
+                img_type = img.get('type', 'unknown')
+                url_short = img['url'][:70] + "..." if len(img['url']) > 70 else img['url']
+                out.append(f"     {i}. [{img_type}] {url_short}")
+        
+        # Show extracted content preview
+        out.append("\n📄 Content Preview:")
+        out.append("-" * 80)
+        description = data.get('description', '')
+        if description:
+            preview = description[:500] + "..." if len(description) > 500 else description
+            out.append(preview)
+        
+        if data.get('content_sections'):
+            out.append("\n📋 Content Sections:")
+            for key, value in data['content_sections'].items():
+                if value and isinstance(value, str):
+                    preview = value[:200] + "..." if len(value) > 200 else value
+                    out.append(f"   • {key}: {preview}")
+        
+        # Show full content preview
+        out.append("\n" + "=" * 80)
+        out.append("📄 FULL CONTENT PREVIEW")
+        out.append("=" * 80)
+        
+        description = data.get('description', '')
+        if description:
+            out.append("\nDescription:")
+            out.append("-" * 80)
+            # Show first 1000 chars
+            preview = description[:1000] + "\n..." if len(description) > 1000 else description
+            out.append(preview)
+        
+        if data.get('content_sections'):
+            out.append("\nContent Sections:")
+            out.append("-" * 80)
+            for key, value in data['content_sections'].items():
+                if value:
+                    if isinstance(value, str):
+                        preview = value[:300] + "..." if len(value) > 300 else value
+                        out.append(f"\n{key.upper()}:")
+                        out.append(f"  {preview}")
+                    elif isinstance(value, dict):
+                        out.append(f"\n{key.upper()}:")
+                        for sub_key, sub_value in value.items():
+                            if isinstance(sub_value, str):
+                                preview = sub_value[:200] + "..." if len(sub_value) > 200 else sub_value
+                                out.append(f"  {sub_key}: {preview}")
+        
+        out.append("\n" + "=" * 80)
+        out.append("✅ DEMO COMPLETE!")
+        out.append("=" * 80)
+        out.append(f"\nSummary:")
+        out.append(f"  • Specifications: {len(data.get('specifications', {}))}")
+        out.append(f"  • Features: {len(data.get('features', []))}")
+        out.append(f"  • Images: {len(images)}")
+        out.append(f"  • Description: {len(description)} characters")
+        out.append(f"  • Content sections: {len(data.get('content_sections', {}))}")
+        out.append("\nAll data extracted successfully! ✓\n")
+        
+    except Exception as e:
+        out.append(f"\n❌ Error: {e}")
+        out.append("\nFull error traceback:")
+        out.append("-" * 80)
+        out.append(traceback.format_exc().rstrip())
+        out.append("-" * 80)
+    finally:
+        sys.stdout.write("\n".join(out) + "\n")
+        # Closing the page frees its DOM right away; the context's memory
+        # is only returned when the pool recycles it
+        await page.close()
+        await pool.release(context)
 
 
 async def main():
@@ -211,12 +456,14 @@ async def main():
         ("5", "https://www.ducati.com/ww/en/bikes/offroad/desmo250-mx", "Desmo250 MX"),
     ]
     
-    # Check for command line argument
-    import sys
-    if len(sys.argv) > 1:
-        # URL provided as argument
-        target_url = sys.argv[1]
-        print(f"\n🎯 Using URL from command line: {target_url}\n")
+    # Check for command line arguments
+    args = sys.argv[1:]
+    data_only = '--data-only' in args
+    args = [arg for arg in args if arg != '--data-only']
+    if args:
+        # URLs provided as arguments
+        target_urls = args
+        print(f"\n🎯 Using {len(target_urls)} URL(s) from command line\n")
     else:
         # Interactive mode (or default)
         print("\n🚀 DUCATI SCRAPER DEMO\n")
@@ -225,22 +472,27 @@ async def main():
             print(f"  {num}. {name}")
             print(f"     {url}")
         
-        print("\nOr enter a custom URL to scrape.")
+        print("\nOr enter custom URLs to scrape, or 'all' for every demo page.")
         try:
-            choice = input("\nEnter number (1-5) or custom URL (or press Enter for option 1): ").strip()
+            choice = input("\nEnter numbers (1-5) or custom URLs separated by spaces, 'all' (or press Enter for option 1): ").strip()
         except (EOFError, KeyboardInterrupt):
             # Non-interactive mode, use default
             choice = ""
             print("\n(Non-interactive mode, using default URL 1)\n")
         
-        if choice.isdigit() and 1 <= int(choice) <= len(demo_urls):
-            target_url = demo_urls[int(choice) - 1][1]
+        if choice.lower() == 'all':
+            target_urls = [url for _, url, _ in demo_urls]
         elif choice:
-            target_url = choice
+            target_urls = []
+            for item in choice.split():
+                if item.isdigit() and 1 <= int(item) <= len(demo_urls):
+                    target_urls.append(demo_urls[int(item) - 1][1])
+                else:
+                    target_urls.append(item)
         else:
-            target_url = demo_urls[0][1]
+            target_urls = [demo_urls[0][1]]
     
-    await demo_scrape_page(target_url)
+    await demo_scrape_pages(target_urls, data_only=data_only)
 
 
 if __name__ == "__main__":
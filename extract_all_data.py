@@ -6,12 +6,17 @@ This script extracts all image URLs including video posters.
 
 import json
 import asyncio
+import re
 from pathlib import Path
 from typing import List, Set
 import sys
 
+import aiofiles
+import aiohttp
+
 sys.path.insert(0, str(Path(__file__).parent))
 
+from src.downloaders.image_head_cache import ImageHeadCache
 from src.processors.normalizer import DataNormalizer
 from src.writers.markdown_writer import MarkdownWriter
 from src.writers.metadata_writer import MetadataWriter
@@ -57,6 +62,24 @@ IMAGE_URLS = [
     "https://images.ctfassets.net/x7j9qwvpvr5s/335oYYeSAkorkIeDbGAwBC/1592dc07e36f12c6f7acc540b8a45d79/MTS-V4-rally-looks-preview-802x561-05.jpg",
 ]
 
+# Deduplicated once, keeping list order so the two video posters stay first
+IMAGE_URLS_UNIQUE = tuple(dict.fromkeys(IMAGE_URLS))
+
+# Contentful image URL up to (not including) its query string
+CTF_IMAGE_RE = re.compile(r'[^?]*ctfassets\.net/[^?]*\.(?:jpe?g|png|webp)[^?]*', re.IGNORECASE)
+
+# Directories already created by this process
+_ENSURED_DIRS: Set[Path] = set()
+
+
+def ensure_dir(path: Path) -> Path:
+    """Create a directory once per process; later calls skip the syscalls."""
+    if path not in _ENSURED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+    return path
+
+
 # Extract unique image URLs from network requests
 def extract_image_urls_from_network(requests_data: List[dict]) -> List[str]:
     """Extract all image URLs from network requests."""
@@ -68,12 +91,12 @@ def extract_image_urls_from_network(requests_data: List[dict]) -> List[str]:
         
         # Collect image resources
         if resource_type == 'image':
-            if 'ctfassets.net' in url and any(ext in url.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp']):
-                # Remove query parameters for cleaner URLs
-                clean_url = url.split('?')[0] if '?' in url else url
-                image_urls.add(clean_url)
+            # The match stops at the query string, leaving a clean URL
+            match = CTF_IMAGE_RE.match(url)
+            if match:
+                image_urls.add(match.group(0))
     
-    return sorted(list(image_urls))
+    return sorted(image_urls)
 
 
 async def extract_and_save_all_data(
@@ -82,21 +105,40 @@ async def extract_and_save_all_data(
     year: int = 2024,
     url: str = "https://www.ducati.com/ww/en/bikes/multistrada/multistrada-v4-rally",
     output_dir: str = "output",
-    images_dir: str = "images"
+    images_dir: str = "images",
+    verify_images: bool = False
 ):
-    """Extract and save all data."""
+    """
+    Extract and save all data.
+    
+    Args:
+        verify_images: Check every image URL with a HEAD request; answers
+            are cached on disk so repeated runs skip the network
+    """
     
     print("=" * 80)
     print("EXTRACTING ALL DATA FROM MULTISTRADA V4 RALLY")
     print("=" * 80)
     
     # Combine all image URLs (from constants + network requests)
-    all_image_urls = list(set(IMAGE_URLS))
+    all_image_urls = IMAGE_URLS_UNIQUE
     
     print(f"\n📸 Images found: {len(all_image_urls)}")
     print(f"   ✓ Video posters: 2")
     print(f"   ✓ Gallery images: {len(all_image_urls) - 2}")
     
+    if verify_images:
+        head_cache = ImageHeadCache()
+        async with aiohttp.ClientSession() as session:
+            heads = await asyncio.gather(
+                *(head_cache.fetch_head(img_url, session) for img_url in all_image_urls)
+            )
+        await head_cache.save()
+        unreachable = [img_url for img_url, head in zip(all_image_urls, heads) if head is None]
+        print(f"   ✓ Verified: {len(all_image_urls) - len(unreachable)}/{len(all_image_urls)}")
+        for img_url in unreachable:
+            print(f"   ⚠ Unreachable: {img_url}")
+    
     # Prepare raw data
     raw_data = {
         'specifications': {
@@ -116,7 +158,6 @@ async def extract_and_save_all_data(
         'colors': ['Ducati Red', 'Jade Green'],
         'price': None,
         'content_sections': {},
-        'images': [{'url': img_url, 'type': 'image'} for img_url in all_image_urls]
     }
     
     # Normalize data
@@ -131,23 +172,23 @@ async def extract_and_save_all_data(
         source_url=url
     )
     
-    # Convert to ImageInfo objects
-    image_infos = []
-    for idx, img_url in enumerate(all_image_urls):
-        img_type = 'hero' if idx < 2 else 'gallery'
-        image_infos.append(ImageInfo(
+    # Convert to ImageInfo objects; the first two URLs are the video posters
+    image_types = ['hero'] * 2 + ['gallery'] * (len(all_image_urls) - 2)
+    bike_data.images = [
+        ImageInfo(
             url=img_url,
-            type=img_type,
-            alt_text=f"{model} {img_type} image {idx + 1}"
-        ))
-    
-    bike_data.images = image_infos
+            image_type=img_type,
+            alt_text=f"{model} {img_type} image {idx}"
+        )
+        for idx, (img_url, img_type) in enumerate(zip(all_image_urls, image_types), 1)
+    ]
     
     # Create output directories
     output_path = Path(output_dir)
+    base = f"{manufacturer}_{model.replace(' ', '_')}_{year}"
     images_path = Path(images_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
-    images_path.mkdir(parents=True, exist_ok=True)
+    ensure_dir(output_path)
+    ensure_dir(images_path)
     
     # Write markdown
     print("\n💾 Saving files...")
@@ -172,7 +213,7 @@ async def extract_and_save_all_data(
         'manufacturer': manufacturer,
         'url': url,
         'title': 'New Multistrada V4 Rally - Designed to take you anywhere',
-        'images': all_image_urls,
+        'images': list(all_image_urls),
         'video_posters': [
             "https://images.ctfassets.net/x7j9qwvpvr5s/5IXVgkiu7t0lkRsePf83gN/bcf2d82c34d0977c855c659b1cb56f7e/MTS-V4-rally-overview-hero-1600x1000-1.jpg",
             "https://images.ctfassets.net/x7j9qwvpvr5s/3EVUy9K4e64kFLGORnK068/e6fc6ebd4128f7ad9630b37cd5041e6b/MTS-V4-rally-overview-hero-1600x1000-02.jpg"
@@ -180,14 +221,16 @@ async def extract_and_save_all_data(
         'total_count': len(all_image_urls)
     }
     
-    images_json_path = output_path / f"{manufacturer}_{model.replace(' ', '_')}_{year}_images.json"
-    with open(images_json_path, 'w', encoding='utf-8') as f:
-        json.dump(images_json, f, indent=2)
+    images_json_path = output_path / f"{base}_images.json"
+    async with aiofiles.open(images_json_path, 'w', encoding='utf-8') as f:
+        # Compact output keeps json on its C encoder (indent= forces the
+        # pure-Python one); pretty-print with `python -m json.tool` if needed
+        await f.write(json.dumps(images_json, separators=(',', ':')) + '\n')
     
     print(f"\n✅ Extraction complete!")
     print(f"   📁 Output directory: {output_path}")
-    print(f"   📄 Markdown: {manufacturer}_{model.replace(' ', '_')}_{year}.md")
-    print(f"   📄 Metadata: {manufacturer}_{model.replace(' ', '_')}_{year}_meta.json")
+    print(f"   📄 Markdown: {base}.md")
+    print(f"   📄 Metadata: {base}_meta.json")
     print(f"   🖼️  Images JSON: {images_json_path.name}")
     print(f"   📊 Total images: {len(all_image_urls)}")
     print(f"   🎬 Video posters: 2")
@@ -206,17 +249,17 @@ async def extract_and_save_all_data(
         'year': year,
         'images_count': len(all_image_urls),
         'video_posters_count': 2,
-        'output_file': str(output_path / f"{manufacturer}_{model.replace(' ', '_')}_{year}.md")
+        'output_file': str(output_path / f"{base}.md")
     }
 
 
 async def main():
     """Main function."""
-    result = await extract_and_save_all_data()
+    result = await extract_and_save_all_data(verify_images='--verify-images' in sys.argv)
     print("\n" + "=" * 80)
     print("EXTRACTION SUMMARY")
     print("=" * 80)
-    print(json.dumps(result, indent=2))
+    sys.stdout.write(json.dumps(result, indent=2) + "\n")
 
 
 if __name__ == "__main__":
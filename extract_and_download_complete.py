@@ -12,14 +12,17 @@ from pathlib import Path
 from typing import List, Dict, Any, Set
 from urllib.parse import urlparse
 import aiohttp
+import aiofiles
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from playwright.async_api import async_playwright
 from src.extractors.data_extractor import DataExtractor
+from src.extractors.ducati_page import (
+    CONTENT_SELECTOR, HOTSPOT_BUTTON_SELECTOR, TOOLTIP_SELECTOR, TOOLTIPS_JS, block_unneeded_resources,
+)
 from src.extractors.image_extractor import ImageExtractor
 from src.processors.normalizer import DataNormalizer
-from src.downloaders.image_downloader import ImageDownloader
+from src.downloaders.image_downloader import ImageDownloader, create_download_session
 from src.writers.markdown_writer import MarkdownWriter
 from src.writers.metadata_writer import MetadataWriter
 from src.utils.schema import BikeDataWithMetadata, ExtractionMetadata, ImageInfo
@@ -27,8 +30,11 @@ from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Stateless, so one instance serves every run
+_NORMALIZER = DataNormalizer()
+
 # All image URLs from network requests
-ALL_IMAGE_URLS = [
+_RAW_IMAGE_URLS = [
     # Video posters
     "https://images.ctfassets.net/x7j9qwvpvr5s/5IXVgkiu7t0lkRsePf83gN/bcf2d82c34d0977c855c659b1cb56f7e/MTS-V4-rally-overview-hero-1600x1000-1.jpg",
     "https://images.ctfassets.net/x7j9qwvpvr5s/3EVUy9K4e64kFLGORnK068/e6fc6ebd4128f7ad9630b37cd5041e6b/MTS-V4-rally-overview-hero-1600x1000-02.jpg",
@@ -63,6 +69,25 @@ ALL_IMAGE_URLS = [
     "https://images.ctfassets.net/x7j9qwvpvr5s/iZbC5MTLOD4Av4u74mCUj/1f345ea0d0e96f900d0cac85fe83ad6f/MTS-V4-rally-looks-preview-802x561-03.jpg",
     "https://images.ctfassets.net/x7j9qwvpvr5s/335oYYeSAkorkIeDbGAwBC/1592dc07e36f12c6f7acc540b8a45d79/MTS-V4-rally-looks-preview-802x561-05.jpg",
 ]
+# Deduplicated in order, so a repeated URL is never downloaded twice
+ALL_IMAGE_URLS = tuple(dict.fromkeys(_RAW_IMAGE_URLS))
+
+# Images downloaded at once; they all come from one CDN host
+MAX_CONCURRENT_DOWNLOADS = 8
+# Print one progress line per this many finished downloads
+PROGRESS_EVERY = 5
+
+# Lean Chromium flags for a headless one-shot scrape
+BROWSER_LAUNCH_ARGS = [
+    '--no-zygote',
+    '--no-sandbox',
+    '--disable-gpu',
+    '--disable-dev-shm-usage',
+    '--disable-accelerated-2d-canvas',
+    '--disable-webgl',
+    '--no-first-run',
+    '--disable-extensions',
+]
 
 
 async def extract_all_content_and_download_images(
@@ -83,18 +108,26 @@ async def extract_all_content_and_download_images(
     print(f"🏍️  Model: {model}")
     print(f"📅 Year: {year}\n")
     
+    # Deferred so importing this module (e.g. for ALL_IMAGE_URLS) stays cheap
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+    
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
+        browser = await p.chromium.launch(headless=True, args=BROWSER_LAUNCH_ARGS)
         context = await browser.new_context(
             viewport={'width': 1920, 'height': 1080},
             user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         )
+        # Short-lived context, so a route handler is fine here
+        await context.route('**/*', block_unneeded_resources)
         page = await context.new_page()
         
         try:
             print("📍 Navigating to page...")
             await page.goto(url, wait_until='domcontentloaded', timeout=60000)
-            await asyncio.sleep(3)
+            try:
+                await page.wait_for_selector(CONTENT_SELECTOR, timeout=15000)
+            except PlaywrightTimeoutError:
+                logger.debug(f"Content selector '{CONTENT_SELECTOR}' not found, continuing")
             
             # Handle cookies
             try:
@@ -110,10 +143,9 @@ async def extract_all_content_and_download_images(
             print("\n📝 Extracting content sections...")
             content_sections = []
             
-            # Get all content divs
-            content_divs = await page.locator('div.content').all()
-            for idx, div in enumerate(content_divs):
-                text = await div.inner_text()
+            # Get all content div texts in one call
+            content_texts = await page.eval_on_selector_all(CONTENT_SELECTOR, 'els => els.map(e => e.innerText)')
+            for idx, text in enumerate(content_texts):
                 if text and text.strip():
                     content_sections.append({
                         'index': idx + 1,
@@ -127,29 +159,16 @@ async def extract_all_content_and_download_images(
             tooltips = []
             
             try:
-                # Find all hotspot buttons
-                hotspot_buttons = await page.locator('[class*="hotspot__button"]').all()
-                print(f"   ✓ Hotspot buttons found: {len(hotspot_buttons)}")
-                
-                for idx, button in enumerate(hotspot_buttons):
-                    try:
-                        # Click the button
-                        await button.click()
-                        await asyncio.sleep(0.5)  # Wait for tooltip to appear
-                        
-                        # Find tooltip content
-                        tooltip = await page.locator('[data-js-tip]').first
-                        if await tooltip.is_visible(timeout=1000):
-                            tooltip_text = await tooltip.inner_text()
-                            if tooltip_text and tooltip_text.strip():
-                                tooltips.append({
-                                    'hotspot_number': idx + 1,
-                                    'content': tooltip_text.strip()
-                                })
-                                print(f"   ✓ Tooltip {idx + 1} extracted")
-                    except Exception as e:
-                        logger.debug(f"Could not extract tooltip {idx + 1}: {e}")
-                        continue
+                # Click all hotspot buttons and read their tooltips in-page
+                result = await page.evaluate(TOOLTIPS_JS, {
+                    'buttonSelector': HOTSPOT_BUTTON_SELECTOR,
+                    'tipSelector': TOOLTIP_SELECTOR,
+                    'timeoutMs': 1500,  # Max wait for each tooltip to appear
+                })
+                print(f"   ✓ Hotspot buttons found: {result['buttons']}")
+                tooltips = result['tooltips']
+                for tooltip in tooltips:
+                    print(f"   ✓ Tooltip {tooltip['hotspot_number']} extracted")
             except Exception as e:
                 logger.debug(f"Error extracting tooltips: {e}")
             
@@ -173,13 +192,20 @@ async def extract_all_content_and_download_images(
             
             # Download all images
             print("\n📥 Downloading images...")
-            image_downloader = ImageDownloader(base_output_dir=images_dir)
-            downloaded_paths = []
+            image_downloader = ImageDownloader(
+                base_output_dir=images_dir,
+                etag_manifest=str(Path(images_dir) / '.etags.json')
+            )
+            # Rate limiting comes from the semaphore and the per-host
+            # connection cap instead of a sleep between downloads
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+            total = len(ALL_IMAGE_URLS)
+            finished = 0
             
-            async with aiohttp.ClientSession() as session:
-                for idx, img_url in enumerate(ALL_IMAGE_URLS):
-                    try:
-                        print(f"   → Downloading image {idx + 1}/{len(ALL_IMAGE_URLS)}: {Path(img_url).name[:50]}...")
+            async def download_one(idx: int, img_url: str, session: aiohttp.ClientSession):
+                nonlocal finished
+                try:
+                    async with semaphore:
                         path = await image_downloader.download_image(
                             url=img_url,
                             manufacturer=manufacturer,
@@ -188,21 +214,35 @@ async def extract_all_content_and_download_images(
                             index=idx,
                             session=session
                         )
-                        if path:
-                            downloaded_paths.append(path)
-                            print(f"      ✓ Saved: {path}")
-                        await asyncio.sleep(0.2)  # Rate limiting
-                    except Exception as e:
-                        logger.error(f"Error downloading {img_url}: {e}")
-                        continue
+                finally:
+                    finished += 1
+                    if finished % PROGRESS_EVERY == 0 or finished == total:
+                        print(f"   → Progress: {finished}/{total}")
+                if path:
+                    # Lazy %-args: nothing is formatted when INFO is filtered out
+                    logger.info("Saved image %d/%d: %s", idx + 1, total, path)
+                return path
+            
+            async with create_download_session(limit_per_host=MAX_CONCURRENT_DOWNLOADS) as session:
+                results = await asyncio.gather(
+                    *(download_one(idx, img_url, session) for idx, img_url in enumerate(ALL_IMAGE_URLS)),
+                    return_exceptions=True
+                )
+            await image_downloader.save_etag_manifest()
+            
+            downloaded_paths = []
+            for img_url, result in zip(ALL_IMAGE_URLS, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error downloading {img_url}: {result}")
+                elif result:
+                    downloaded_paths.append(result)
             
             print(f"\n   ✅ Downloaded {len(downloaded_paths)} images")
             
             # Prepare normalized data
             data['images'] = [{'url': img_url, 'type': 'image'} for img_url in ALL_IMAGE_URLS]
             
-            normalizer = DataNormalizer()
-            bike_data = normalizer.normalize(
+            bike_data = _NORMALIZER.normalize(
                 raw_data=data,
                 manufacturer=manufacturer,
                 model=model,
@@ -216,7 +256,7 @@ async def extract_all_content_and_download_images(
                 img_type = 'hero' if idx < 2 else 'gallery'
                 image_infos.append(ImageInfo(
                     url=img_url,
-                    type=img_type,
+                    image_type=img_type,
                     alt_text=f"{model} {img_type} image {idx + 1}"
                 ))
             
@@ -255,8 +295,10 @@ async def extract_all_content_and_download_images(
             }
             
             content_json_path = output_path / f"{manufacturer}_{model.replace(' ', '_')}_{year}_content.json"
-            with open(content_json_path, 'w', encoding='utf-8') as f:
-                json.dump(content_json, f, indent=2)
+            async with aiofiles.open(content_json_path, 'w', encoding='utf-8') as f:
+                # Compact output keeps json on its C encoder (indent= forces
+                # the pure-Python one)
+                await f.write(json.dumps(content_json, separators=(',', ':')) + '\n')
             
             print(f"\n✅ Extraction and download complete!")
             print(f"   📁 Output directory: {output_path}")
@@ -281,6 +323,8 @@ async def extract_all_content_and_download_images(
             traceback.print_exc()
             return None
         finally:
+            # Context memory is only released when the context is closed
+            await context.close()
             await browser.close()
 
 
@@ -5,11 +5,15 @@ This script parses the snapshot files created by Cursor browser to extract
 specifications, features, images, and other data.
 """
 
+import asyncio
 import sys
 import json
+import mmap
+import os
 import re
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime
 from urllib.parse import urlparse
 
@@ -24,6 +28,48 @@ from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Stateless, so one instance serves every snapshot
+_NORMALIZER = DataNormalizer()
+
+# Snapshot YAML fields in one alternation, so the snapshot is scanned once:
+# link names, image refs and name text. It sits in a lookahead so a link or
+# image match doesn't hide the name fields it spans (they are text content
+# too); the leading class skips positions that can't start a field.
+# Bytes pattern: it runs over the memory-mapped file.
+_SNAPSHOT_RE = re.compile(
+    rb'(?=[rn])'
+    rb'(?=role:\s*link[^\n]*\n[^\n]*name:\s*(?P<link>.+?)(?:\n|$)'
+    rb'|role:\s*img[^\n]*\n[^\n]*ref:\s*(?P<img>ref-\w+)'
+    rb'|name:\s*(?P<name>.+?)(?:\n|$))'
+)
+
+# Common specification value patterns, one named group per spec
+_SPEC_VALUE_RE = re.compile(
+    r'(?P<power>\d+(?:\.\d+)?)\s*(?:hp|HP|kW|kw)'
+    r'|(?P<torque>\d+(?:\.\d+)?)\s*(?:lb-ft|Nm|kgm|N·m)'
+    r'|(?P<weight>\d+(?:\.\d+)?)\s*kg'
+    r'|(?P<displacement>\d+(?:,\d+)?)\s*cc'
+    r'|(?P<top_speed>\d+)\s*(?:km/h|mph)',
+    re.IGNORECASE
+)
+SPEC_VALUE_KEYS = ['power', 'torque', 'weight', 'displacement', 'top_speed']
+
+# Specification keywords whose following text (to the end of the line) is
+# taken as the value
+SPEC_KEYWORDS = ['power', 'torque', 'weight', 'displacement', 'engine', 'transmission',
+                 'suspension', 'brakes', 'dimensions', 'fuel', 'capacity']
+_SPEC_KEYWORD_RE = re.compile(rf'({"|".join(SPEC_KEYWORDS)})[:\s]+', re.IGNORECASE)
+
+# Navigation text skipped from content, and keywords marking feature
+# sentences; one alternation each instead of a substring test per word
+_NAV_TEXT_RE = re.compile(r'cookie|menu|navigation|button', re.IGNORECASE)
+FEATURE_KEYWORDS = ['feature', 'technology', 'equipment', 'standard', 'optional',
+                    'includes', 'equipped', 'system']
+_FEATURE_KEYWORD_RE = re.compile('|'.join(FEATURE_KEYWORDS), re.IGNORECASE)
+
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]\s+')
+_YEAR_RE = re.compile(r'(\d{4})')
+
 
 def parse_snapshot_file(snapshot_path: Path) -> Dict[str, Any]:
     """
@@ -35,45 +81,29 @@ def parse_snapshot_file(snapshot_path: Path) -> Dict[str, Any]:
     Returns:
         Dictionary with extracted information
     """
-    content = snapshot_path.read_text(encoding='utf-8', errors='ignore')
-    
     # Extract URL and title from header
     url = None
     title = None
-    
-    for line in content.split('\n')[:50]:  # Check first 50 lines
-        if 'Page URL:' in line:
-            url = line.split('Page URL:')[1].strip()
-        if 'Page Title:' in line:
-            title = line.split('Page Title:')[1].strip()
-            break
-    
-    # Extract text content from YAML structure
-    # Look for name fields which contain text content
     text_content = []
     images = []
     links = []
     
-    # Simple regex to extract name fields (text content)
-    name_pattern = r'name:\s*(.+?)(?:\n|$)'
-    matches = re.findall(name_pattern, content)
-    
-    for match in matches:
-        text = match.strip()
-        if text and len(text) > 3:  # Filter out very short strings
-            # Skip navigation elements
-            if not any(skip in text.lower() for skip in ['cookie', 'menu', 'navigation', 'button']):
-                text_content.append(text)
-    
-    # Extract image references
-    img_pattern = r'role:\s*img[^\n]*\n[^\n]*ref:\s*(ref-\w+)'
-    img_refs = re.findall(img_pattern, content)
-    images = [f"Image ref: {ref}" for ref in img_refs[:20]]  # Limit to first 20
-    
-    # Extract links
-    link_pattern = r'role:\s*link[^\n]*\n[^\n]*name:\s*(.+?)(?:\n|$)'
-    link_matches = re.findall(link_pattern, content)
-    links = [link.strip() for link in link_matches[:30]]  # Limit to first 30
+    with open(snapshot_path, 'rb') as f:
+        for raw_line in islice(f, 50):  # Check first 50 lines
+            line = raw_line.decode('utf-8', errors='ignore')
+            if 'Page URL:' in line:
+                url = line.split('Page URL:')[1].strip()
+            if 'Page Title:' in line:
+                title = line.split('Page Title:')[1].strip()
+                break
+        
+        # mmap cannot map an empty file
+        content_length = os.fstat(f.fileno()).st_size
+        if content_length:
+            # Scan the mapped file instead of reading it into a str; only the
+            # captured fields are decoded
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                _collect_snapshot_fields(content, text_content, images, links)
     
     return {
         'url': url,
@@ -82,82 +112,129 @@ def parse_snapshot_file(snapshot_path: Path) -> Dict[str, Any]:
         'images': images,
         'links': links,
         'snapshot_file': str(snapshot_path),
-        'content_length': len(content)
+        'content_length': content_length
     }
 
 
-def extract_specifications_from_text(text_content: List[str]) -> Dict[str, Any]:
+def _collect_snapshot_fields(content, text_content: List[str], images: List[str], links: List[str]) -> None:
+    """
+    Extract text content, image references and links from snapshot YAML.
+    
+    Args:
+        content: Snapshot bytes (or mmap)
+        text_content: List to append name field text to
+        images: List to append image references to
+        links: List to append link names to
+    """
+    # Lookahead matches consume nothing, so remember where each field last
+    # matched to keep its matches from overlapping (as separate passes did)
+    match_end = dict.fromkeys(('link', 'img', 'name'), 0)
+    for match in _SNAPSHOT_RE.finditer(content):
+        kind = match.lastgroup
+        if match.start() < match_end[kind]:
+            continue
+        match_end[kind] = match.end(kind)
+        
+        if kind == 'img':
+            if len(images) < 20:  # Limit to first 20
+                images.append(f"Image ref: {match.group('img').decode('ascii')}")
+            continue
+        
+        text = match.group(kind).decode('utf-8', errors='ignore').strip()
+        if kind == 'link':
+            if len(links) < 30:  # Limit to first 30
+                links.append(text)
+            continue
+        
+        if text and len(text) > 3:  # Filter out very short strings
+            # Skip navigation elements
+            if not _NAV_TEXT_RE.search(text):
+                text_content.append(text)
+
+
+def extract_specifications_from_text(text_content: List[str], full_text: Optional[str] = None) -> Dict[str, Any]:
     """
     Extract specifications from text content using pattern matching.
     
     Args:
         text_content: List of text strings from page
+        full_text: text_content already joined with spaces, if available
         
     Returns:
         Dictionary of specifications
     """
     specs = {}
     
-    # Common specification patterns
-    patterns = {
-        'power': r'(\d+(?:\.\d+)?)\s*(?:hp|HP|kW|kw)',
-        'torque': r'(\d+(?:\.\d+)?)\s*(?:lb-ft|Nm|kgm|N·m)',
-        'weight': r'(\d+(?:\.\d+)?)\s*kg',
-        'displacement': r'(\d+(?:,\d+)?)\s*cc',
-        'top_speed': r'(\d+)\s*(?:km/h|mph)',
-    }
-    
-    full_text = ' '.join(text_content)
+    if full_text is None:
+        full_text = ' '.join(text_content)
     
-    for key, pattern in patterns.items():
-        matches = re.findall(pattern, full_text, re.IGNORECASE)
-        if matches:
-            specs[key] = matches[0] if matches else None
-    
-    # Look for specification tables or sections
-    spec_keywords = ['power', 'torque', 'weight', 'displacement', 'engine', 'transmission', 
-                     'suspension', 'brakes', 'dimensions', 'fuel', 'capacity']
+    # First value of each spec, in one pass over the text
+    values = {}
+    for match in _SPEC_VALUE_RE.finditer(full_text):
+        values.setdefault(match.lastgroup, match.group(match.lastgroup))
+        if len(values) == len(SPEC_VALUE_KEYS):
+            break
     
-    for keyword in spec_keywords:
-        # Find text near keyword
-        pattern = rf'{keyword}[:\s]+([^\n]+?)(?:\n|$)'
-        matches = re.findall(pattern, full_text, re.IGNORECASE)
-        if matches:
-            specs[keyword] = matches[0].strip()[:100]  # Limit length
+    # Look for specification tables or sections: the text after the first
+    # occurrence of each keyword, also in one pass
+    keyword_values = {}
+    for match in _SPEC_KEYWORD_RE.finditer(full_text):
+        keyword = match.group(1).lower()
+        if keyword in keyword_values:
+            continue
+        line_end = full_text.find('\n', match.end())
+        value = full_text[match.end():line_end if line_end != -1 else None]
+        if value:
+            keyword_values[keyword] = value.strip()[:100]  # Limit length
+            if len(keyword_values) == len(SPEC_KEYWORDS):
+                break
+    
+    for key in SPEC_VALUE_KEYS:
+        if key in values:
+            specs[key] = values[key]
+    for keyword in SPEC_KEYWORDS:
+        if keyword in keyword_values:
+            specs[keyword] = keyword_values[keyword]
     
     return specs
 
 
-def extract_features_from_text(text_content: List[str]) -> List[str]:
+def extract_features_from_text(text_content: List[str], full_text: Optional[str] = None) -> List[str]:
     """
     Extract features from text content.
     
     Args:
         text_content: List of text strings from page
+        full_text: text_content already joined with spaces, if available
         
     Returns:
         List of features
     """
     features = []
     
-    # Look for feature-like text (bullet points, lists, etc.)
-    feature_keywords = ['feature', 'technology', 'equipment', 'standard', 'optional', 
-                       'includes', 'equipped', 'system']
-    
-    full_text = ' '.join(text_content)
+    if full_text is None:
+        full_text = ' '.join(text_content)
     
     # Simple heuristic: look for capitalized phrases that might be features
     # This is a basic implementation - could be improved
-    sentences = re.split(r'[.!?]\s+', full_text)
-    
-    for sentence in sentences:
+    for sentence in _iter_sentences(full_text):
         sentence = sentence.strip()
-        # Look for feature-like sentences
-        if any(keyword in sentence.lower() for keyword in feature_keywords):
-            if len(sentence) > 10 and len(sentence) < 200:
-                features.append(sentence)
+        # Look for feature-like sentences (bullet points, lists, etc.)
+        if 10 < len(sentence) < 200 and _FEATURE_KEYWORD_RE.search(sentence):
+            features.append(sentence)
+            if len(features) == 20:  # Limit to 20 features
+                break
     
-    return features[:20]  # Limit to 20 features
+    return features
+
+
+def _iter_sentences(text: str) -> Iterator[str]:
+    """Yield the pieces of text between sentence breaks, lazily."""
+    start = 0
+    for match in _SENTENCE_SPLIT_RE.finditer(text):
+        yield text[start:match.start()]
+        start = match.end()
+    yield text[start:]
 
 
 async def process_snapshot(
@@ -184,8 +261,8 @@ async def process_snapshot(
     
     print(f"\n📄 Processing snapshot: {snapshot_path.name}")
     
-    # Parse snapshot
-    parsed_data = parse_snapshot_file(snapshot_path)
+    # Parse snapshot; regex work runs in a thread to keep the event loop free
+    parsed_data = await asyncio.to_thread(parse_snapshot_file, snapshot_path)
     
     print(f"   ✓ URL: {parsed_data.get('url', 'Unknown')}")
     print(f"   ✓ Title: {parsed_data.get('title', 'Unknown')}")
@@ -194,8 +271,11 @@ async def process_snapshot(
     
     # Extract specifications and features
     text_content = parsed_data.get('text_content', [])
-    specifications = extract_specifications_from_text(text_content)
-    features = extract_features_from_text(text_content)
+    full_text = ' '.join(text_content)
+    specifications, features = await asyncio.gather(
+        asyncio.to_thread(extract_specifications_from_text, text_content, full_text),
+        asyncio.to_thread(extract_features_from_text, text_content, full_text),
+    )
     
     print(f"   ✓ Specifications: {len(specifications)}")
     print(f"   ✓ Features: {len(features)}")
@@ -215,13 +295,11 @@ async def process_snapshot(
             model = model_part.replace('-', ' ').title()
     
     # Try to extract year from title or URL
-    year_match = re.search(r'(\d{4})', title)
+    year_match = _YEAR_RE.search(title)
     if year_match:
         year = int(year_match.group(1))
     
     # Normalize data
-    normalizer = DataNormalizer()
-    
     raw_data = {
         'specifications': specifications,
         'features': features,
@@ -232,7 +310,7 @@ async def process_snapshot(
         'images': parsed_data.get('images', [])
     }
     
-    bike_data = normalizer.normalize(
+    bike_data = _NORMALIZER.normalize(
         raw_data=raw_data,
         manufacturer=manufacturer,
         model=model,
@@ -308,7 +386,6 @@ async def main():
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
 
 
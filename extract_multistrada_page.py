@@ -8,9 +8,11 @@ import sys
 import json
 import re
 import asyncio
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
+import aiofiles
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -23,110 +25,186 @@ from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Navigation/chrome text left out of the page content, in one alternation
+# instead of a lowercase copy and a substring test per word
+_SKIP_TEXT_RE = re.compile(
+    r'cookie|menu|navigation|button|close|login|sign up|myducati|the land of joy',
+    re.IGNORECASE
+)
 
-def extract_urls_from_snapshot(snapshot_path: Path, base_url: str) -> Dict[str, List[str]]:
+# Every snapshot URL source in one alternation, so the snapshot is scanned
+# once: bare https URLs (Contentful images and links), video posters, src
+# attributes and CSS url() values. It sits in a lookahead so a src/poster
+# match doesn't hide the bare URL inside it; the leading class lets the
+# engine skip positions that can't start any of them. A url() value stops
+# at the first quote, paren or space (as unquoted CSS URLs must), so an
+# unclosed "url(" can't drag the scan across the rest of the snapshot.
+# Snapshot patterns are bytes: the file is scanned undecoded and only the
+# captured fields are decoded.
+_SNAPSHOT_URL_RE = re.compile(
+    rb'(?=[hpsu])'
+    rb'(?=(?P<url>https://[^\s<>"\']+)'
+    rb'|(?P<poster>poster="(?P<poster_url>[^"]+)")'
+    rb'|(?P<src>src="(?P<src_url>[^"]+\.(?:jpg|jpeg|png|gif|webp|svg))")'
+    rb'|(?P<css>url\(["\']?(?P<css_url>[^"\'()\s]+\.(?:jpg|jpeg|png|gif|webp|svg))["\']?\)))',
+    re.IGNORECASE
+)
+_CTF_URL_RE = re.compile(rb'https://images\.ctfassets\.net/[^\s<>"\']', re.IGNORECASE)
+_IMAGE_EXT_RE = re.compile(rb'\.(?:jpg|jpeg|png|gif|webp|svg)', re.IGNORECASE)
+
+_NAME_RE = re.compile(rb'name:\s*(.+?)(?:\n|$)')
+
+# Specification value patterns
+_POWER_RE = re.compile(r'(?P<value>\d+(?:\.\d+)?)\s*(?:hp|HP|kW|kw)')
+_TORQUE_RE = re.compile(r'(?P<value>\d+(?:\.\d+)?)\s*(?P<unit>lb-ft|Nm|kgm|N·m|lb ft)')
+_WEIGHT_RE = re.compile(r'(?P<value>\d+(?:\.\d+)?)\s*kg')
+_DISPLACEMENT_RE = re.compile(r'(?P<value>\d+(?:,\d+)?)\s*cc')
+
+FEATURE_KEYWORDS = ['system', 'technology', 'equipment', 'feature', 'includes',
+                    'equipped', 'standard', 'optional', 'control', 'assist']
+_FEATURE_KEYWORD_RE = re.compile('|'.join(FEATURE_KEYWORDS), re.IGNORECASE)
+
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]\s+')
+_YEAR_RE = re.compile(r'(\d{4})')
+
+
+def _decode(raw: bytes) -> str:
+    """Decode a captured snapshot field, dropping invalid UTF-8."""
+    return raw.decode('utf-8', errors='ignore')
+
+
+def extract_urls_from_snapshot(content: bytes, base_url: str) -> Dict[str, List[str]]:
     """
-    Extract all URLs (images, video posters, etc.) from snapshot file.
+    Extract all URLs (images, video posters, etc.) from snapshot content.
     
     Args:
-        snapshot_path: Path to snapshot file
+        content: Raw snapshot file bytes
         base_url: Base URL for resolving relative URLs
         
     Returns:
         Dictionary with 'images', 'video_posters', 'links' lists
     """
-    content = snapshot_path.read_text(encoding='utf-8', errors='ignore')
-    
-    images = []
+    image_urls = []
     video_posters = []
-    links = []
-    
-    # Extract image URLs from various sources
-    # Look for URLs in the content
-    url_patterns = [
-        r'https://[^\s<>"\']+\.(jpg|jpeg|png|gif|webp|svg)',
-        r'https://images\.ctfassets\.net/[^\s<>"\']+',
-        r'poster="([^"]+)"',
-        r'src="([^"]+\.(jpg|jpeg|png|gif|webp|svg))"',
-        r'url\(["\']?([^"\']+\.(jpg|jpeg|png|gif|webp|svg))["\']?\)',
-    ]
-    
-    # Extract all URLs
-    all_urls = set()
-    for pattern in url_patterns:
-        matches = re.findall(pattern, content, re.IGNORECASE)
-        for match in matches:
-            if isinstance(match, tuple):
-                url = match[0] if match[0].startswith('http') else match[1] if len(match) > 1 and match[1].startswith('http') else None
+    link_matches = []
+    
+    # Lookahead matches consume nothing, so remember where each source last
+    # matched to keep its matches from overlapping (as separate passes did)
+    match_end = dict.fromkeys(('ctf', 'link', 'poster', 'src', 'css'), 0)
+    for match in _SNAPSHOT_URL_RE.finditer(content):
+        kind = match.lastgroup
+        start = match.start()
+        end = match.end(kind)
+        
+        if kind == 'url':
+            url = match.group('url')
+            if start >= match_end['ctf'] and _CTF_URL_RE.match(url):
+                match_end['ctf'] = end
+                # Only keep Contentful URLs that name an image file
+                if url.startswith(b'http') and _IMAGE_EXT_RE.search(url):
+                    image_urls.append(_decode(url))
+            if start >= match_end['link'] and url.startswith(b'https://'):
+                match_end['link'] = end
+                link_matches.append(_decode(url))
+            continue
+        
+        if start < match_end[kind]:
+            continue
+        match_end[kind] = end
+        url = match.group(f'{kind}_url')
+        if url.startswith(b'http'):
+            # Separate video posters; src and url() values already end
+            # in an image extension
+            if kind == 'poster':
+                video_posters.append(_decode(url))
             else:
-                url = match
-            if url and url.startswith('http'):
-                all_urls.add(url)
-    
-    # Separate video posters
-    poster_pattern = r'poster="([^"]+)"'
-    poster_matches = re.findall(poster_pattern, content, re.IGNORECASE)
-    for poster_url in poster_matches:
-        if poster_url.startswith('http'):
-            video_posters.append(poster_url)
-            all_urls.add(poster_url)
+                image_urls.append(_decode(url))
+    
+    # dict.fromkeys dedupes while keeping page order, so the first images
+    # (used as hero shots) are the ones that appear first on the page
+    video_posters = dict.fromkeys(video_posters)
     
     # All other image URLs
-    for url in all_urls:
-        if any(ext in url.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg']):
-            if url not in video_posters:
-                images.append(url)
+    images = dict.fromkeys(url for url in image_urls if url not in video_posters)
     
     # Extract links
-    link_pattern = r'https://[^\s<>"\']+'
-    link_matches = re.findall(link_pattern, content)
-    for link in link_matches:
-        if 'ducati.com' in link and link not in images and link not in video_posters:
-            links.append(link)
+    links = [
+        link for link in dict.fromkeys(link_matches)
+        if 'ducati.com' in link and link not in images and link not in video_posters
+    ]
     
     return {
-        'images': sorted(list(set(images))),
-        'video_posters': sorted(list(set(video_posters))),
-        'links': sorted(list(set(links)))[:50]  # Limit links
+        'images': list(images),
+        'video_posters': list(video_posters),
+        'links': links[:50]  # Limit links
     }
 
 
-def extract_text_content(snapshot_path: Path) -> Dict[str, Any]:
+def _iter_lines(content: bytes) -> Iterator[bytes]:
+    """Yield the lines of content one at a time, without splitting it all up front."""
+    start = 0
+    while True:
+        end = content.find(b'\n', start)
+        if end < 0:
+            yield content[start:]
+            return
+        yield content[start:end]
+        start = end + 1
+
+
+def _parse_page_header(content: bytes) -> Tuple[Optional[str], Optional[str]]:
     """
-    Extract text content from snapshot.
+    Read the page URL and title from the snapshot header.
     
     Args:
-        snapshot_path: Path to snapshot file
+        content: Raw snapshot file bytes
         
     Returns:
-        Dictionary with text content organized by type
+        (url, title) tuple, with None for anything not found
     """
-    content = snapshot_path.read_text(encoding='utf-8', errors='ignore')
-    
-    # Extract URL and title
     url = None
     title = None
     
-    for line in content.split('\n')[:100]:
+    for raw_line in islice(_iter_lines(content), 100):
+        line = _decode(raw_line)
         if 'Page URL:' in line:
             url = line.split('Page URL:')[1].strip()
         if 'Page Title:' in line:
             title = line.split('Page Title:')[1].strip()
             break
     
+    return url, title
+
+
+def _iter_sentences(text: str) -> Iterator[str]:
+    """Yield the pieces of text between sentence breaks, lazily."""
+    start = 0
+    for match in _SENTENCE_SPLIT_RE.finditer(text):
+        yield text[start:match.start()]
+        start = match.end()
+    yield text[start:]
+
+
+def extract_text_content(content: bytes) -> Dict[str, Any]:
+    """
+    Extract text content from snapshot.
+    
+    Args:
+        content: Raw snapshot file bytes
+        
+    Returns:
+        Dictionary with text content organized by type
+    """
+    # Extract URL and title
+    url, title = _parse_page_header(content)
+    
     # Extract all name fields (text content)
-    name_pattern = r'name:\s*(.+?)(?:\n|$)'
     all_text = []
     
-    matches = re.findall(name_pattern, content)
-    for match in matches:
-        text = match.strip()
+    for match in _NAME_RE.finditer(content):
+        text = _decode(match.group(1)).strip()
         # Filter out very short strings and navigation elements
-        if (len(text) > 5 and 
-            not any(skip in text.lower() for skip in [
-                'cookie', 'menu', 'navigation', 'button', 'close', 
-                'login', 'sign up', 'myducati', 'the land of joy'
-            ])):
+        if len(text) > 5 and not _SKIP_TEXT_RE.search(text):
             all_text.append(text)
     
     # Extract specifications
@@ -134,36 +212,34 @@ def extract_text_content(snapshot_path: Path) -> Dict[str, Any]:
     full_text = ' '.join(all_text)
     
     # Power
-    power_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:hp|HP|kW|kw)', full_text)
+    power_match = _POWER_RE.search(full_text)
     if power_match:
-        specs['power'] = power_match.group(1) + ' hp'
+        specs['power'] = f"{power_match['value']} hp"
     
     # Torque
-    torque_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:lb-ft|Nm|kgm|N·m|lb ft)', full_text)
+    torque_match = _TORQUE_RE.search(full_text)
     if torque_match:
-        specs['torque'] = torque_match.group(1) + ' ' + (torque_match.group(0).split()[-1] if ' ' in torque_match.group(0) else 'Nm')
+        specs['torque'] = f"{torque_match['value']} {torque_match['unit']}"
     
     # Weight
-    weight_match = re.search(r'(\d+(?:\.\d+)?)\s*kg\s*(?:\([^)]+\))?', full_text)
+    weight_match = _WEIGHT_RE.search(full_text)
     if weight_match:
-        specs['weight'] = weight_match.group(1) + ' kg'
+        specs['weight'] = f"{weight_match['value']} kg"
     
     # Displacement
-    displacement_match = re.search(r'(\d+(?:,\d+)?)\s*cc', full_text)
+    displacement_match = _DISPLACEMENT_RE.search(full_text)
     if displacement_match:
-        specs['displacement'] = displacement_match.group(1).replace(',', '') + ' cc'
+        specs['displacement'] = f"{displacement_match['value'].replace(',', '')} cc"
     
     # Extract features (look for feature-like text)
     features = []
-    feature_keywords = ['system', 'technology', 'equipment', 'feature', 'includes', 
-                       'equipped', 'standard', 'optional', 'control', 'assist']
     
-    sentences = re.split(r'[.!?]\s+', full_text)
-    for sentence in sentences:
+    for sentence in _iter_sentences(full_text):
         sentence = sentence.strip()
-        if (any(keyword in sentence.lower() for keyword in feature_keywords) and
-            len(sentence) > 15 and len(sentence) < 300):
+        if 15 < len(sentence) < 300 and _FEATURE_KEYWORD_RE.search(sentence):
             features.append(sentence)
+            if len(features) == 30:  # Limit to 30 features
+                break
     
     # Description (first substantial text block)
     description = ' '.join(all_text[:1000])[:2000]  # First 2000 chars
@@ -172,12 +248,18 @@ def extract_text_content(snapshot_path: Path) -> Dict[str, Any]:
         'url': url,
         'title': title,
         'specifications': specs,
-        'features': features[:30],  # Limit to 30 features
+        'features': features,
         'description': description,
         'all_text': all_text
     }
 
 
+async def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    """Write data as compact JSON; compact separators let json use its C encoder."""
+    async with aiofiles.open(path, 'w', encoding='utf-8') as f:
+        await f.write(json.dumps(data, separators=(',', ':')) + '\n')
+
+
 async def extract_and_save(
     snapshot_file: str,
     manufacturer: str = "Ducati",
@@ -201,12 +283,20 @@ async def extract_and_save(
     print("EXTRACTING DATA FROM MULTISTRADA V4 RALLY PAGE")
     print("=" * 80)
     
+    # Read the snapshot once and share it between both extractors
+    content = snapshot_path.read_bytes()
+    
     # Extract URLs
     print("\n📸 Extracting images and video posters...")
-    text_data = extract_text_content(snapshot_path)
-    base_url = text_data.get('url', 'https://www.ducati.com')
-    
-    urls_data = extract_urls_from_snapshot(snapshot_path, base_url)
+    page_url, _ = _parse_page_header(content)
+    base_url = page_url or 'https://www.ducati.com'
+    
+    # Both extractors scan the whole snapshot; run them in threads to keep
+    # the event loop free
+    text_data, urls_data = await asyncio.gather(
+        asyncio.to_thread(extract_text_content, content),
+        asyncio.to_thread(extract_urls_from_snapshot, content, base_url),
+    )
     
     print(f"   ✓ Images found: {len(urls_data['images'])}")
     print(f"   ✓ Video posters found: {len(urls_data['video_posters'])}")
@@ -230,7 +320,7 @@ async def extract_and_save(
     year = 2024
     
     # Try to extract year from title
-    year_match = re.search(r'(\d{4})', title)
+    year_match = _YEAR_RE.search(title)
     if year_match:
         year = int(year_match.group(1))
     
@@ -262,7 +352,7 @@ async def extract_and_save(
     for idx, img_url in enumerate(all_images[:50]):  # Limit to 50 images
         image_infos.append(ImageInfo(
             url=img_url,
-            type='hero' if idx < 2 else 'gallery',
+            image_type='hero' if idx < 2 else 'gallery',
             alt_text=f"{model} image {idx + 1}"
         ))
     
@@ -274,12 +364,8 @@ async def extract_and_save(
     output_path.mkdir(parents=True, exist_ok=True)
     images_path.mkdir(parents=True, exist_ok=True)
     
-    # Write markdown
     print("\n💾 Saving files...")
     markdown_writer = MarkdownWriter(output_dir=str(output_path))
-    await markdown_writer.write_bike_markdown(bike_data, [])
-    
-    # Write metadata
     metadata_writer = MetadataWriter(output_dir=str(output_path))
     metadata = BikeDataWithMetadata(
         bike_data=bike_data,
@@ -288,7 +374,6 @@ async def extract_and_save(
             page_types=['main']
         )
     )
-    await metadata_writer.write_metadata(metadata)
     
     # Also save image URLs to a separate JSON file
     images_json = {
@@ -302,8 +387,13 @@ async def extract_and_save(
     }
     
     images_json_path = output_path / f"{manufacturer}_{model.replace(' ', '_')}_{year}_images.json"
-    with open(images_json_path, 'w', encoding='utf-8') as f:
-        json.dump(images_json, f, indent=2)
+    
+    # Markdown, metadata and images JSON are separate files; write them together
+    await asyncio.gather(
+        markdown_writer.write_bike_markdown(bike_data, []),
+        metadata_writer.write_metadata(metadata),
+        _write_json(images_json_path, images_json),
+    )
     
     print(f"\n✅ Extraction complete!")
     print(f"   📁 Output directory: {output_path}")
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Extract data from Multistrada V4 Rally page using Playwright.
+Extract data from a bike page using Playwright (Multistrada V4 Rally by default).
 This gets the actual HTML content including all image URLs.
 """
 
@@ -8,13 +8,16 @@ import asyncio
 import sys
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlparse
 import re
+import aiofiles
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, Browser, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 from src.extractors.data_extractor import DataExtractor
+from src.extractors.ducati_page import block_heavy_requests
 from src.extractors.image_extractor import ImageExtractor
 from src.processors.normalizer import DataNormalizer
 from src.writers.markdown_writer import MarkdownWriter
@@ -24,211 +27,282 @@ from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Image sources read from the live DOM in one round trip, instead of
+# regex passes over the serialized page.content() HTML
+IMAGE_SOURCES_JS = """
+() => {
+    const collect = (selector, read) => Array.from(document.querySelectorAll(selector), read);
+    return {
+        images: collect('img', img => img.currentSrc || img.src),
+        posters: collect('video[poster]', video => video.poster),
+        srcsets: collect('source[srcset]', source => source.srcset),
+        styles: collect('[style*="background-image"]', el => el.getAttribute('style')),
+    };
+}
+"""
+
+CONTENT_SELECTOR = 'div.content'
+COOKIE_ACCEPT_SELECTOR = 'button:has-text("Accept"), button:has-text("Accept All")'
+
+_BG_RE = re.compile(r'background-image:\s*url\(["\']?([^"\')]+)["\']?\)', re.IGNORECASE)
+_YEAR_RE = re.compile(r'(\d{4})')
+
+
+def _model_from_url(url: str) -> str:
+    """Derive a model name from the last URL path segment (multistrada-v4-rally -> Multistrada V4 Rally)."""
+    slug = urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+    return slug.replace('-', ' ').replace('_', ' ').title()
+
+
+async def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    """Write data to path as compact JSON."""
+    async with aiofiles.open(path, 'w', encoding='utf-8') as f:
+        await f.write(json.dumps(data, separators=(',', ':')) + '\n')
+
 
 async def extract_page_data(
     url: str = "https://www.ducati.com/ww/en/bikes/multistrada/multistrada-v4-rally",
     manufacturer: str = "Ducati",
     output_dir: str = "output",
-    images_dir: str = "images"
+    images_dir: str = "images",
+    browser: Optional[Browser] = None,
+    model: Optional[str] = None
 ):
-    """Extract all data from the page."""
+    """
+    Extract all data from the page.
+    
+    Args:
+        url: Bike page URL
+        manufacturer: Manufacturer name
+        output_dir: Directory for markdown/metadata/JSON output
+        images_dir: Directory for downloaded images
+        browser: Already launched browser to open the page in; when None,
+            one is launched for this page and closed afterwards
+        model: Model name used in the output filenames; derived from the
+            URL slug when None
+    
+    Returns:
+        Summary dict, or None if extraction failed
+    """
+    if browser is None:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            try:
+                return await extract_page_data(url, manufacturer, output_dir, images_dir, browser, model)
+            finally:
+                await browser.close()
+    
+    if model is None:
+        model = _model_from_url(url)
     
     print("=" * 80)
-    print("EXTRACTING DATA FROM MULTISTRADA V4 RALLY PAGE")
+    print(f"EXTRACTING DATA FROM {model.upper()} PAGE")
     print("=" * 80)
     print(f"\n🎯 URL: {url}")
     print(f"🏭 Manufacturer: {manufacturer}\n")
     
-    async with async_playwright() as p:
-        # Launch browser in headless mode (or visible if you prefer)
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        )
-        page = await context.new_page()
+    context = await browser.new_context(
+        viewport={'width': 1920, 'height': 1080},
+        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    )
+    await context.route('**/*', block_heavy_requests)
+    page = await context.new_page()
+    
+    try:
+        print("📍 Navigating to page...")
+        await page.goto(url, wait_until='domcontentloaded', timeout=60000)
+        # Wait for the page content instead of a fixed sleep
+        try:
+            await page.wait_for_selector(CONTENT_SELECTOR, timeout=15000)
+        except PlaywrightTimeoutError:
+            logger.debug(f"Content selector '{CONTENT_SELECTOR}' not found, continuing")
+        
+        # Get page title
+        title = await page.title()
+        print(f"   ✓ Page loaded: {title}")
         
+        # Handle cookies if present; the click timeout doubles as the
+        # visibility check
         try:
-            print("📍 Navigating to page...")
-            await page.goto(url, wait_until='domcontentloaded', timeout=60000)
-            await asyncio.sleep(3)  # Wait for content to load
-            
-            # Get page title
-            title = await page.title()
-            print(f"   ✓ Page loaded: {title}")
-            
-            # Handle cookies if present
-            try:
-                cookie_button = page.locator('button:has-text("Accept"), button:has-text("Accept All")').first
-                if await cookie_button.is_visible(timeout=2000):
-                    await cookie_button.click()
-                    await asyncio.sleep(1)
-                    print("   ✓ Cookies accepted")
-            except:
-                pass
-            
-            # Get HTML content to extract image URLs
-            print("\n📸 Extracting images and video posters...")
-            html_content = await page.content()
-            
-            # Extract all image URLs
-            image_urls = []
-            video_posters = []
-            
-            # Extract from img tags
-            img_pattern = r'<img[^>]+src=["\']([^"\']+)["\']'
-            img_matches = re.findall(img_pattern, html_content, re.IGNORECASE)
-            for img_url in img_matches:
-                if img_url.startswith('http') and img_url not in image_urls:
-                    image_urls.append(img_url)
-            
-            # Extract from video poster attributes
-            poster_pattern = r'poster=["\']([^"\']+)["\']'
-            poster_matches = re.findall(poster_pattern, html_content, re.IGNORECASE)
-            for poster_url in poster_matches:
-                if poster_url.startswith('http') and poster_url not in video_posters:
-                    video_posters.append(poster_url)
-            
-            # Extract from background-image CSS
-            bg_pattern = r'background-image:\s*url\(["\']?([^"\')]+)["\']?\)'
-            bg_matches = re.findall(bg_pattern, html_content, re.IGNORECASE)
-            for bg_url in bg_matches:
-                if bg_url.startswith('http') and bg_url not in image_urls:
-                    image_urls.append(bg_url)
-            
-            # Extract from picture/source tags
-            source_pattern = r'<source[^>]+srcset=["\']([^"\']+)["\']'
-            source_matches = re.findall(source_pattern, html_content, re.IGNORECASE)
-            for srcset in source_matches:
-                # srcset can contain multiple URLs
-                urls = re.findall(r'https://[^\s,]+', srcset)
-                for url in urls:
-                    if url not in image_urls:
-                        image_urls.append(url)
-            
-            # Combine all images
-            all_images = sorted(list(set(image_urls + video_posters)))
-            
-            print(f"   ✓ Images found: {len(image_urls)}")
-            print(f"   ✓ Video posters found: {len(video_posters)}")
-            print(f"   ✓ Total unique images: {len(all_images)}")
-            
-            # Extract data using extractors
-            print("\n📝 Extracting specifications, features, and content...")
-            data_extractor = DataExtractor()
-            data = await data_extractor.extract_from_page(page, 'main')
-            
-            print(f"   ✓ Specifications: {len(data.get('specifications', {}))}")
-            print(f"   ✓ Features: {len(data.get('features', []))}")
-            print(f"   ✓ Description length: {len(data.get('description', ''))} chars")
-            
-            # Extract model and year
-            model = "Multistrada V4 Rally"
-            year = 2024
-            
-            # Try to extract year from title
-            year_match = re.search(r'(\d{4})', title)
-            if year_match:
-                year = int(year_match.group(1))
-            
-            # Add images to data
-            data['images'] = [{'url': img_url, 'type': 'image'} for img_url in all_images]
-            
-            # Normalize data
-            print("\n🔄 Normalizing data...")
-            normalizer = DataNormalizer()
-            
-            bike_data = normalizer.normalize(
-                raw_data=data,
-                manufacturer=manufacturer,
-                model=model,
-                year=year,
-                source_url=url
-            )
-            
-            # Convert to ImageInfo objects
-            image_infos = []
-            for idx, img_url in enumerate(all_images[:50]):  # Limit to 50
-                img_type = 'hero' if idx < 2 else 'gallery'
-                image_infos.append(ImageInfo(
-                    url=img_url,
-                    type=img_type,
-                    alt_text=f"{model} {img_type} image {idx + 1}"
-                ))
-            
-            bike_data.images = image_infos
-            
-            # Create output directories
-            output_path = Path(output_dir)
-            images_path = Path(images_dir)
-            output_path.mkdir(parents=True, exist_ok=True)
-            images_path.mkdir(parents=True, exist_ok=True)
-            
-            # Write markdown
-            print("\n💾 Saving files...")
-            markdown_writer = MarkdownWriter(output_dir=str(output_path))
-            await markdown_writer.write_bike_markdown(bike_data, [])
-            
-            # Write metadata
-            metadata_writer = MetadataWriter(output_dir=str(output_path))
-            metadata = BikeDataWithMetadata(
-                bike_data=bike_data,
-                extraction=ExtractionMetadata(
-                    source_urls=[url],
-                    page_types=['main']
-                )
+            await page.locator(COOKIE_ACCEPT_SELECTOR).first.click(timeout=2000)
+            print("   ✓ Cookies accepted")
+        except PlaywrightError:
+            # No banner or a failed click; neither matters for extraction
+            pass
+        
+        # Read image sources from the live DOM
+        print("\n📸 Extracting images and video posters...")
+        # The DataExtractor only reads the 'main' page, so its queries can
+        # share the CDP connection with the image-source evaluate
+        data_extractor = DataExtractor()
+        sources, data = await asyncio.gather(
+            page.evaluate(IMAGE_SOURCES_JS),
+            data_extractor.extract_from_page(page, 'main'),
+        )
+        
+        # Extract all image URLs
+        # Extract from img tags
+        image_urls = [img_url for img_url in sources['images'] if img_url.startswith('http')]
+        
+        # Extract from video poster attributes
+        video_posters = [poster_url for poster_url in sources['posters'] if poster_url.startswith('http')]
+        
+        # Extract from inline background-image styles
+        for style in sources['styles']:
+            image_urls.extend(bg_url for bg_url in _BG_RE.findall(style) if bg_url.startswith('http'))
+        
+        # Extract from picture/source tags
+        for srcset in sources['srcsets']:
+            # srcset holds comma-separated "url descriptor" candidates
+            for candidate in srcset.split(','):
+                src = candidate.strip().split(' ', 1)[0]
+                if src.startswith('http'):
+                    image_urls.append(src)
+        
+        # Dedupe keeping page order, so the 'hero' entries below are the
+        # first images on the page
+        image_urls = list(dict.fromkeys(image_urls))
+        video_posters = list(dict.fromkeys(video_posters))
+        
+        # Combine all images
+        all_images = list(dict.fromkeys(image_urls + video_posters))
+        
+        print(f"   ✓ Images found: {len(image_urls)}")
+        print(f"   ✓ Video posters found: {len(video_posters)}")
+        print(f"   ✓ Total unique images: {len(all_images)}")
+        
+        print("\n📝 Extracting specifications, features, and content...")
+        print(f"   ✓ Specifications: {len(data.get('specifications', {}))}")
+        print(f"   ✓ Features: {len(data.get('features', []))}")
+        print(f"   ✓ Description length: {len(data.get('description', ''))} chars")
+        
+        # Extract year; the model comes from the argument or URL slug
+        year = 2024
+        
+        # Try to extract year from title
+        year_match = _YEAR_RE.search(title)
+        if year_match:
+            year = int(year_match.group(1))
+        
+        # Add images to data
+        data['images'] = [{'url': img_url, 'type': 'image'} for img_url in all_images]
+        
+        # Normalize data
+        print("\n🔄 Normalizing data...")
+        normalizer = DataNormalizer()
+        
+        bike_data = normalizer.normalize(
+            raw_data=data,
+            manufacturer=manufacturer,
+            model=model,
+            year=year,
+            source_url=url
+        )
+        
+        # Convert to ImageInfo objects
+        image_infos = []
+        for idx, img_url in enumerate(all_images[:50]):  # Limit to 50
+            img_type = 'hero' if idx < 2 else 'gallery'
+            image_infos.append(ImageInfo(
+                url=img_url,
+                image_type=img_type,
+                alt_text=f"{model} {img_type} image {idx + 1}"
+            ))
+        
+        bike_data.images = image_infos
+        
+        # Create output directories
+        output_path = Path(output_dir)
+        images_path = Path(images_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        images_path.mkdir(parents=True, exist_ok=True)
+        
+        print("\n💾 Saving files...")
+        markdown_writer = MarkdownWriter(output_dir=str(output_path))
+        metadata_writer = MetadataWriter(output_dir=str(output_path))
+        metadata = BikeDataWithMetadata(
+            bike_data=bike_data,
+            extraction=ExtractionMetadata(
+                source_urls=[url],
+                page_types=['main']
             )
-            await metadata_writer.write_metadata(metadata)
-            
-            # Save image URLs to JSON
-            images_json = {
-                'model': model,
-                'year': year,
-                'manufacturer': manufacturer,
-                'url': url,
-                'title': title,
-                'images': image_urls,
-                'video_posters': video_posters,
-                'all_images': all_images,
-                'total_count': len(all_images)
-            }
-            
-            images_json_path = output_path / f"{manufacturer}_{model.replace(' ', '_')}_{year}_images.json"
-            with open(images_json_path, 'w', encoding='utf-8') as f:
-                json.dump(images_json, f, indent=2)
-            
-            print(f"\n✅ Extraction complete!")
-            print(f"   📁 Output directory: {output_path}")
-            print(f"   📄 Markdown: {manufacturer}_{model.replace(' ', '_')}_{year}.md")
-            print(f"   📄 Metadata: {manufacturer}_{model.replace(' ', '_')}_{year}_meta.json")
-            print(f"   🖼️  Images JSON: {images_json_path.name}")
-            print(f"   📊 Total images: {len(all_images)}")
-            print(f"   🎬 Video posters: {len(video_posters)}")
-            
-            # Print sample image URLs
-            print("\n📸 Sample Image URLs:")
-            for i, img_url in enumerate(all_images[:10], 1):
-                print(f"   {i}. {img_url}")
-            if len(all_images) > 10:
-                print(f"   ... and {len(all_images) - 10} more")
-            
-            return {
-                'success': True,
-                'manufacturer': manufacturer,
-                'model': model,
-                'year': year,
-                'images_count': len(all_images),
-                'video_posters_count': len(video_posters),
-                'specifications_count': len(data.get('specifications', {})),
-                'features_count': len(data.get('features', [])),
-                'output_file': str(output_path / f"{manufacturer}_{model.replace(' ', '_')}_{year}.md")
-            }
-            
-        except Exception as e:
-            print(f"\n❌ Error: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+        )
+        
+        # Save image URLs to JSON
+        images_json = {
+            'model': model,
+            'year': year,
+            'manufacturer': manufacturer,
+            'url': url,
+            'title': title,
+            'images': image_urls,
+            'video_posters': video_posters,
+            'all_images': all_images,
+            'total_count': len(all_images)
+        }
+        
+        images_json_path = output_path / f"{manufacturer}_{model.replace(' ', '_')}_{year}_images.json"
+        
+        # Markdown, metadata and images JSON are separate files; write them together
+        await asyncio.gather(
+            markdown_writer.write_bike_markdown(bike_data, []),
+            metadata_writer.write_metadata(metadata),
+            _write_json(images_json_path, images_json),
+        )
+        
+        print(f"\n✅ Extraction complete!")
+        print(f"   📁 Output directory: {output_path}")
+        print(f"   📄 Markdown: {manufacturer}_{model.replace(' ', '_')}_{year}.md")
+        print(f"   📄 Metadata: {manufacturer}_{model.replace(' ', '_')}_{year}_meta.json")
+        print(f"   🖼️  Images JSON: {images_json_path.name}")
+        print(f"   📊 Total images: {len(all_images)}")
+        print(f"   🎬 Video posters: {len(video_posters)}")
+        
+        # Print sample image URLs
+        print("\n📸 Sample Image URLs:")
+        for i, img_url in enumerate(all_images[:10], 1):
+            print(f"   {i}. {img_url}")
+        if len(all_images) > 10:
+            print(f"   ... and {len(all_images) - 10} more")
+        
+        return {
+            'success': True,
+            'manufacturer': manufacturer,
+            'model': model,
+            'year': year,
+            'images_count': len(all_images),
+            'video_posters_count': len(video_posters),
+            'specifications_count': len(data.get('specifications', {})),
+            'features_count': len(data.get('features', [])),
+            'output_file': str(output_path / f"{manufacturer}_{model.replace(' ', '_')}_{year}.md")
+        }
+        
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+    finally:
+        # The browser may be shared with other pages; only this page's
+        # context is ours to close
+        await context.close()
+
+
+async def extract_pages(urls: List[str], manufacturer: str = "Ducati",
+                        output_dir: str = "output", images_dir: str = "images") -> List[Optional[Dict[str, Any]]]:
+    """
+    Extract several pages one after another from a single browser launch.
+    
+    Each page's model name is derived from its own URL, so every URL
+    writes its own markdown, metadata and images JSON files.
+    """
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            return [
+                await extract_page_data(url, manufacturer, output_dir, images_dir, browser)
+                for url in urls
+            ]
         finally:
             await browser.close()
 
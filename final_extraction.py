@@ -9,19 +9,26 @@ import json
 import aiohttp
 import aiofiles
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List
 
-sys.path.insert(0, str(Path(__file__).parent))
+# Ensure project root is in path
+project_root = Path(__file__).parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 from src.processors.normalizer import DataNormalizer
 from src.writers.markdown_writer import MarkdownWriter
 from src.writers.metadata_writer import MetadataWriter
 from src.utils.schema import BikeDataWithMetadata, ExtractionMetadata, ImageInfo
-from src.downloaders.image_downloader import ImageDownloader
+from src.downloaders.image_downloader import ImageDownloader, create_download_session
+from src.utils.consent_state import STATE_FILE, state_is_fresh
+from src.extractors.ducati_page import (
+    CONTENT_SELECTOR, HOTSPOT_BUTTON_SELECTOR, TOOLTIP_SELECTOR, TOOLTIPS_JS, block_unneeded_resources,
+)
 
 # All image URLs
-IMAGE_URLS = [
+_RAW_IMAGE_URLS = [
     "https://images.ctfassets.net/x7j9qwvpvr5s/5IXVgkiu7t0lkRsePf83gN/bcf2d82c34d0977c855c659b1cb56f7e/MTS-V4-rally-overview-hero-1600x1000-1.jpg",
     "https://images.ctfassets.net/x7j9qwvpvr5s/3EVUy9K4e64kFLGORnK068/e6fc6ebd4128f7ad9630b37cd5041e6b/MTS-V4-rally-overview-hero-1600x1000-02.jpg",
     "https://images.ctfassets.net/x7j9qwvpvr5s/4a6hZcNBIGditITuBTTVdx/7385fd8ae2a33f2d056d2f22aca52a24/2025-10-06_Multistrada-V4-Rally-ENG-Curve-768x480.jpg",
@@ -54,6 +61,20 @@ IMAGE_URLS = [
     "https://images.ctfassets.net/x7j9qwvpvr5s/iZbC5MTLOD4Av4u74mCUj/1f345ea0d0e96f900d0cac85fe83ad6f/MTS-V4-rally-looks-preview-802x561-03.jpg",
     "https://images.ctfassets.net/x7j9qwvpvr5s/335oYYeSAkorkIeDbGAwBC/1592dc07e36f12c6f7acc540b8a45d79/MTS-V4-rally-looks-preview-802x561-05.jpg",
 ]
+# Ordered and unique, so a repeated entry can't be downloaded twice
+IMAGE_URLS = tuple(dict.fromkeys(_RAW_IMAGE_URLS))
+# Display names for progress output, built once instead of a Path per URL
+IMAGE_NAMES = tuple(img_url.rsplit('/', 1)[-1][:50] for img_url in IMAGE_URLS)
+
+# Downloads in flight at once; this cap replaces the old sleep between downloads
+MAX_CONCURRENT_DOWNLOADS = 8
+
+
+async def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    """Write data to path as compact JSON."""
+    async with aiofiles.open(path, 'w', encoding='utf-8') as f:
+        await f.write(json.dumps(data, separators=(',', ':')) + '\n')
+
 
 async def main():
     url = "https://www.ducati.com/ww/en/bikes/multistrada/multistrada-v4-rally"
@@ -71,152 +92,183 @@ async def main():
     print(f"🏍️  Model: {model}")
     print(f"📅 Year: {year}\n")
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(viewport={'width': 1920, 'height': 1080})
-        page = await context.new_page()
-        
-        try:
-            print("📍 Navigating to page...")
-            await page.goto(url, wait_until='domcontentloaded', timeout=60000)
-            await asyncio.sleep(3)
-            
-            # Handle cookies
-            try:
-                cookie_btn = page.locator('button:has-text("Accept")').first
-                if await cookie_btn.is_visible(timeout=2000):
-                    await cookie_btn.click()
-                    await asyncio.sleep(1)
-                    print("   ✓ Cookies accepted")
-            except:
-                pass
-            
-            # Extract content divs
-            print("\n📝 Extracting content sections...")
-            content_sections = []
-            content_divs = await page.locator('div.content').all()
-            for idx, div in enumerate(content_divs):
-                text = await div.inner_text()
-                if text and text.strip():
-                    content_sections.append({'index': idx + 1, 'text': text.strip()})
-            print(f"   ✓ Found {len(content_sections)} content sections")
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            # Consent saved by an earlier run (or demo_scraper) skips the banner
+            state_restored = state_is_fresh()
+            context = await browser.new_context(
+                storage_state=str(STATE_FILE) if state_restored else None,
+                viewport={'width': 1920, 'height': 1080}
+            )
+            await context.route('**/*', block_unneeded_resources)
+            page = await context.new_page()
             
-            # Extract tooltips
-            print("\n🔍 Extracting tooltips...")
-            tooltips = []
             try:
-                hotspot_buttons = await page.locator('[class*="hotspot__button"]').all()
-                print(f"   ✓ Found {len(hotspot_buttons)} hotspot buttons")
-                for idx, btn in enumerate(hotspot_buttons):
+                print("📍 Navigating to page...")
+                await page.goto(url, wait_until='domcontentloaded', timeout=60000)
+                # Wait for the content sections instead of a fixed sleep
+                try:
+                    await page.wait_for_selector(CONTENT_SELECTOR, timeout=15000)
+                except PlaywrightTimeoutError:
+                    pass
+                
+                # Handle cookies; click() waits for the button, up to the timeout
+                if state_restored:
+                    print("   ✓ Cookies already accepted")
+                else:
                     try:
-                        await btn.click()
-                        await asyncio.sleep(0.5)
-                        tooltip = page.locator('[data-js-tip]').first
-                        if await tooltip.is_visible(timeout=1000):
-                            text = await tooltip.inner_text()
-                            if text and text.strip():
-                                tooltips.append({'hotspot': idx + 1, 'content': text.strip()})
-                                print(f"   ✓ Tooltip {idx + 1} extracted")
-                    except:
-                        continue
-            except Exception as e:
-                print(f"   ⚠️  Tooltip extraction error: {e}")
-            print(f"   ✓ Extracted {len(tooltips)} tooltips")
-            
-            # Download images
-            print(f"\n📥 Downloading {len(IMAGE_URLS)} images...")
-            downloader = ImageDownloader(base_output_dir=images_dir)
-            downloaded = []
-            
-            async with aiohttp.ClientSession() as session:
-                for idx, img_url in enumerate(IMAGE_URLS):
-                    try:
-                        path = await downloader.download_image(
-                            url=img_url, manufacturer=manufacturer,
-                            model=model, year=year, index=idx, session=session
-                        )
-                        if path:
-                            downloaded.append(path)
-                            print(f"   ✓ [{idx + 1}/{len(IMAGE_URLS)}] {Path(img_url).name[:50]}")
-                        await asyncio.sleep(0.2)
-                    except Exception as e:
-                        print(f"   ✗ [{idx + 1}/{len(IMAGE_URLS)}] Error: {e}")
-            
-            print(f"\n   ✅ Downloaded {len(downloaded)}/{len(IMAGE_URLS)} images")
-            
-            # Prepare data
-            raw_data = {
-                'specifications': {
-                    'power': '170 hp', 'torque': '123.8 Nm',
-                    'weight': '240 kg', 'displacement': '1158 cc'
-                },
-                'features': [
-                    '30-litre fuel tank', 'Long-travel suspension',
-                    'Advanced electronics package', 'Off-road focused design'
-                ],
-                'description': 'Multistrada V4 Rally is your definitive travel companion, taking you on a journey to unexplored lands, with a focus on comfort and versatility.',
-                'colors': ['Ducati Red', 'Jade Green'],
-                'price': None,
-                'content_sections': {
-                    'main_content': [s['text'] for s in content_sections],
-                    'tooltips': {t['hotspot']: t['content'] for t in tooltips}
-                },
-                'images': [{'url': u, 'type': 'image'} for u in IMAGE_URLS]
-            }
-            
-            # Normalize
-            normalizer = DataNormalizer()
-            bike_data = normalizer.normalize(
-                raw_data=raw_data, manufacturer=manufacturer,
-                model=model, year=year, source_url=url
-            )
-            
-            # Convert images
-            bike_data.images = [
-                ImageInfo(url=u, type='hero' if i < 2 else 'gallery',
-                         alt_text=f"{model} image {i + 1}")
-                for i, u in enumerate(IMAGE_URLS)
-            ]
-            
-            # Save files
-            print("\n💾 Saving files...")
-            output_path = Path(output_dir)
-            output_path.mkdir(parents=True, exist_ok=True)
-            
-            markdown_writer = MarkdownWriter(output_dir=str(output_path))
-            await markdown_writer.write_bike_markdown(bike_data, downloaded)
-            
-            metadata_writer = MetadataWriter(output_dir=str(output_path))
-            metadata = BikeDataWithMetadata(
-                bike_data=bike_data,
-                extraction=ExtractionMetadata(source_urls=[url], page_types=['main'])
+                        await page.locator('button:has-text("Accept")').first.click(timeout=2000)
+                        print("   ✓ Cookies accepted")
+                    except PlaywrightError:
+                        # Optional banner: a missing, detached or covered
+                        # button must not abort the extraction
+                        pass
+                    else:
+                        # Save the consent cookie for later runs
+                        try:
+                            STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+                            await context.storage_state(path=str(STATE_FILE))
+                        except Exception as e:
+                            print(f"   ⚠️  Could not save consent state: {e}")
+                
+                # Extract content divs
+                print("\n📝 Extracting content sections...")
+                content_sections = []
+                # All section texts in one round-trip
+                content_texts = await page.locator(CONTENT_SELECTOR).all_inner_texts()
+                for idx, text in enumerate(content_texts):
+                    if text and text.strip():
+                        content_sections.append({'index': idx + 1, 'text': text.strip()})
+                print(f"   ✓ Found {len(content_sections)} content sections")
+                
+                # Extract tooltips
+                print("\n🔍 Extracting tooltips...")
+                tooltips = []
+                try:
+                    # One in-page pass clicks each hotspot and polls for its tooltip
+                    result = await page.evaluate(TOOLTIPS_JS, {
+                        'buttonSelector': HOTSPOT_BUTTON_SELECTOR,
+                        'tipSelector': TOOLTIP_SELECTOR,
+                        'timeoutMs': 1500,  # Old click sleep plus visibility wait
+                    })
+                    print(f"   ✓ Found {result['buttons']} hotspot buttons")
+                    for tooltip in result['tooltips']:
+                        tooltips.append({'hotspot': tooltip['hotspot_number'], 'content': tooltip['content']})
+                        print(f"   ✓ Tooltip {tooltip['hotspot_number']} extracted")
+                except Exception as e:
+                    print(f"   ⚠️  Tooltip extraction error: {e}")
+                print(f"   ✓ Extracted {len(tooltips)} tooltips")
+            finally:
+                await browser.close()
+        
+        # Download images. Nothing from here on needs the browser, so it is
+        # already closed rather than held open through downloads and writes
+        print(f"\n📥 Downloading {len(IMAGE_URLS)} images...")
+        # Images already on disk are revalidated with If-None-Match and
+        # not downloaded again when the server answers 304
+        downloader = ImageDownloader(
+            base_output_dir=images_dir,
+            etag_manifest=str(Path(images_dir) / '.etags.json')
+        )
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+        
+        async def download_one(idx: int, img_url: str, session: aiohttp.ClientSession):
+            async with semaphore:
+                try:
+                    path = await downloader.download_image(
+                        url=img_url, manufacturer=manufacturer,
+                        model=model, year=year, index=idx, session=session
+                    )
+                except Exception as e:
+                    print(f"   ✗ [{idx + 1}/{len(IMAGE_URLS)}] Error: {e}")
+                    return None
+            if path:
+                print(f"   ✓ [{idx + 1}/{len(IMAGE_URLS)}] {IMAGE_NAMES[idx]}")
+            return path
+        
+        async with create_download_session(limit_per_host=MAX_CONCURRENT_DOWNLOADS) as session:
+            results = await asyncio.gather(
+                *(download_one(idx, img_url, session) for idx, img_url in enumerate(IMAGE_URLS))
             )
-            await metadata_writer.write_metadata(metadata)
-            
-            # Save content JSON
-            content_json = {
-                'model': model, 'year': year, 'manufacturer': manufacturer,
-                'url': url, 'content_sections': content_sections,
-                'tooltips': tooltips, 'images_downloaded': len(downloaded),
-                'image_paths': downloaded
-            }
-            content_path = output_path / f"{manufacturer}_{model.replace(' ', '_')}_{year}_content.json"
-            with open(content_path, 'w', encoding='utf-8') as f:
-                json.dump(content_json, f, indent=2)
-            
-            print(f"\n✅ COMPLETE!")
-            print(f"   📁 Output: {output_path}")
-            print(f"   📄 Markdown: {manufacturer}_{model.replace(' ', '_')}_{year}.md")
-            print(f"   🖼️  Images: {len(downloaded)}/{len(IMAGE_URLS)}")
-            print(f"   📝 Content sections: {len(content_sections)}")
-            print(f"   🔍 Tooltips: {len(tooltips)}")
-            
-        except Exception as e:
-            print(f"\n❌ ERROR: {e}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            await browser.close()
+        await downloader.save_etag_manifest()
+        # Keep URL order in the markdown regardless of completion order
+        downloaded = [path for path in results if path]
+        
+        print(f"\n   ✅ Downloaded {len(downloaded)}/{len(IMAGE_URLS)} images")
+        
+        # Prepare data
+        raw_data = {
+            'specifications': {
+                'power': '170 hp', 'torque': '123.8 Nm',
+                'weight': '240 kg', 'displacement': '1158 cc'
+            },
+            'features': [
+                '30-litre fuel tank', 'Long-travel suspension',
+                'Advanced electronics package', 'Off-road focused design'
+            ],
+            'description': 'Multistrada V4 Rally is your definitive travel companion, taking you on a journey to unexplored lands, with a focus on comfort and versatility.',
+            'colors': ['Ducati Red', 'Jade Green'],
+            'price': None,
+            'content_sections': {
+                'main_content': [s['text'] for s in content_sections],
+                'tooltips': {t['hotspot']: t['content'] for t in tooltips}
+            },
+            'images': [{'url': u, 'type': 'image'} for u in IMAGE_URLS]
+        }
+        
+        # Normalize
+        normalizer = DataNormalizer()
+        bike_data = normalizer.normalize(
+            raw_data=raw_data, manufacturer=manufacturer,
+            model=model, year=year, source_url=url
+        )
+        
+        # Convert images
+        bike_data.images = [
+            ImageInfo(url=u, image_type='hero' if i < 2 else 'gallery',
+                     alt_text=f"{model} image {i + 1}")
+            for i, u in enumerate(IMAGE_URLS)
+        ]
+        
+        # Save files
+        print("\n💾 Saving files...")
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        
+        markdown_writer = MarkdownWriter(output_dir=str(output_path))
+        metadata_writer = MetadataWriter(output_dir=str(output_path))
+        metadata = BikeDataWithMetadata(
+            bike_data=bike_data,
+            extraction=ExtractionMetadata(source_urls=[url], page_types=['main'])
+        )
+        
+        # Save content JSON
+        content_json = {
+            'model': model, 'year': year, 'manufacturer': manufacturer,
+            'url': url, 'content_sections': content_sections,
+            'tooltips': tooltips, 'images_downloaded': len(downloaded),
+            'image_paths': downloaded
+        }
+        content_path = output_path / f"{manufacturer}_{model.replace(' ', '_')}_{year}_content.json"
+        # Markdown, metadata and content JSON don't depend on each other
+        await asyncio.gather(
+            markdown_writer.write_bike_markdown(bike_data, downloaded),
+            metadata_writer.write_metadata(metadata),
+            _write_json(content_path, content_json),
+        )
+        
+        print(f"\n✅ COMPLETE!")
+        print(f"   📁 Output: {output_path}")
+        print(f"   📄 Markdown: {manufacturer}_{model.replace(' ', '_')}_{year}.md")
+        print(f"   🖼️  Images: {len(downloaded)}/{len(IMAGE_URLS)}")
+        print(f"   📝 Content sections: {len(content_sections)}")
+        print(f"   🔍 Tooltips: {len(tooltips)}")
+    
+    except Exception as e:
+        print(f"\n❌ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
 
 if __name__ == "__main__":
     asyncio.run(main())
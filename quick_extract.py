@@ -4,14 +4,19 @@
 import asyncio
 import sys
 from pathlib import Path
+from typing import List
 
-sys.path.insert(0, str(Path(__file__).parent))
+# Ensure project root is in path
+project_root = Path(__file__).parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
-async def test():
+async def test(urls: List[str]):
     try:
-        from extract_with_playwright import extract_page_data
+        from extract_with_playwright import extract_page_data, extract_pages
         print("Starting extraction...")
-        result = await extract_page_data()
+        # Several URLs share one browser launch
+        result = await extract_pages(urls) if urls else await extract_page_data()
         print(f"Result: {result}")
     except Exception as e:
         print(f"Error: {e}")
@@ -19,6 +24,8 @@ async def test():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    asyncio.run(test())
-
-
+    import argparse
+    parser = argparse.ArgumentParser(description="Quick extraction test")
+    parser.add_argument('urls', nargs='*', help="Bike page URLs (default: Multistrada V4 Rally)")
+    args = parser.parse_args()
+    asyncio.run(test(args.urls))
@@ -1,20 +1,25 @@
 """Simple runner for the Ducati scraper with immediate feedback."""
 import asyncio
+import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
-# Write to file for immediate feedback
+# Write to file for immediate feedback. A listener thread does the file
+# I/O (FileHandler flushes every line), so log() never blocks the event loop
 log_file = Path("scraper_run.log")
-with open(log_file, 'w') as f:
-    f.write("Starting scraper...\n")
-    f.flush()
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, logging.FileHandler(log_file, mode='w', encoding='utf-8'))
+_file_logger = logging.getLogger('run_scraper')
+_file_logger.setLevel(logging.INFO)
+_file_logger.propagate = False  # Console output comes from print()
+_file_logger.addHandler(QueueHandler(_log_queue))
 
 def log(msg):
     """Log to both file and console."""
     print(msg)
-    with open(log_file, 'a') as f:
-        f.write(msg + "\n")
-        f.flush()
+    _file_logger.info(msg)
 
 async def main():
     log("=" * 60)
@@ -60,8 +65,14 @@ async def main():
         raise
 
 if __name__ == "__main__":
-    log("Script entry point reached")
-    asyncio.run(main())
-    log("Script finished")
+    _log_listener.start()
+    try:
+        _file_logger.info("Starting scraper...")
+        log("Script entry point reached")
+        asyncio.run(main())
+        log("Script finished")
+    finally:
+        # Drains the queue before exiting
+        _log_listener.stop()
 
 
@@ -2,6 +2,7 @@
 Image downloading components.
 """
 
-from src.downloaders.image_downloader import ImageDownloader
+from src.downloaders.image_downloader import ImageDownloader, create_download_session
+from src.downloaders.image_head_cache import ImageHeadCache
 
-__all__ = ['ImageDownloader']
+__all__ = ['ImageDownloader', 'ImageHeadCache', 'create_download_session']
@@ -1,47 +1,138 @@
 """Image downloader with SHA-256 deduplication and semantic naming."""
+import asyncio
 import hashlib
+import json
 import re
 from pathlib import Path
-from typing import Optional, Set
+from typing import Dict, Optional, Set
 import aiohttp
 import aiofiles
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Connection budget for image downloads; keep-alive and DNS caching let every
+# image from the same CDN host reuse one TLS connection
+DOWNLOAD_CONNECTION_LIMIT = 32
+DOWNLOAD_CONNECTIONS_PER_HOST = 8
+
+# Throttling answers from the CDN that are retried with backoff
+RETRY_STATUSES = frozenset({429, 503})
+MAX_DOWNLOAD_ATTEMPTS = 3
+# Longest wait between attempts; a Retry-After beyond it ends the download
+# instead of holding a download slot that long
+MAX_RETRY_DELAY = 30
+
+
+def create_download_session(
+    limit_per_host: int = DOWNLOAD_CONNECTIONS_PER_HOST, timeout: float = 30
+) -> aiohttp.ClientSession:
+    """Create the aiohttp session shared by all downloads of a run."""
+    connector = aiohttp.TCPConnector(
+        limit=DOWNLOAD_CONNECTION_LIMIT,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=300,
+        keepalive_timeout=60,
+        enable_cleanup_closed=True,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout))
+
 class ImageDownloader:
-    def __init__(self, base_output_dir: str, max_size_mb: float = 10.0):
+    def __init__(self, base_output_dir: str, max_size_mb: float = 10.0, etag_manifest: Optional[str] = None):
         self.base_output_dir = Path(base_output_dir)
         self.max_size_mb = max_size_mb
         self.image_hashes: Set[str] = set()
+        # url -> {'etag', 'path', 'hash'} of earlier downloads; lets re-runs
+        # send If-None-Match and skip unchanged bodies on 304
+        self.etag_manifest = Path(etag_manifest) if etag_manifest else None
+        self.etags: Dict[str, Dict[str, str]] = {}
+        if self.etag_manifest and self.etag_manifest.exists():
+            try:
+                self.etags = json.loads(self.etag_manifest.read_text(encoding='utf-8'))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable ETag manifest {self.etag_manifest}: {e}")
+
+    async def save_etag_manifest(self) -> None:
+        if not self.etag_manifest:
+            return
+        self.etag_manifest.parent.mkdir(parents=True, exist_ok=True)
+        async with aiofiles.open(self.etag_manifest, 'w', encoding='utf-8') as f:
+            await f.write(json.dumps(self.etags))
 
     async def download_image(
         self, url: str, manufacturer: str, model: str, year: int,
         index: int, session: aiohttp.ClientSession
     ) -> Optional[str]:
+        headers = {}
+        relative_path = self._relative_path(url, manufacturer, model, year, index)
+        cached = self.etags.get(url) if self.etag_manifest else None
+        # A 304 only stands in for the file this call would write; an entry
+        # saved under another name (other index or caller) is downloaded again
+        if (cached and cached['path'] == relative_path
+                and (self.base_output_dir / relative_path).exists()):
+            headers['If-None-Match'] = cached['etag']
+        else:
+            cached = None
         try:
-            async with session.get(url, timeout=30) as response:
-                if response.status != 200:
-                    return None
-                image_data = await response.read()
-                image_hash = hashlib.sha256(image_data).hexdigest()
-                if image_hash in self.image_hashes:
+            for attempt in range(MAX_DOWNLOAD_ATTEMPTS):
+                async with session.get(url, headers=headers, timeout=30) as response:
+                    if response.status not in RETRY_STATUSES or attempt == MAX_DOWNLOAD_ATTEMPTS - 1:
+                        return await self._save_response(response, url, cached, relative_path)
+                    delay = self._retry_delay(response, attempt)
+                if delay is None:
+                    logger.warning(f"{url} returned {response.status} with a Retry-After over {MAX_RETRY_DELAY}s, giving up")
                     return None
-                self.image_hashes.add(image_hash)
-                ext = 'jpg'
-                if '.png' in url.lower(): ext = 'png'
-                elif '.webp' in url.lower(): ext = 'webp'
-                safe_name = self._sanitize_filename(f"{manufacturer}_{model}_{year}")
-                filename = f"{safe_name}_{index:03d}.{ext}"
-                folder = self.base_output_dir / manufacturer / model / str(year)
-                folder.mkdir(parents=True, exist_ok=True)
-                filepath = folder / filename
-                async with aiofiles.open(filepath, 'wb') as f:
-                    await f.write(image_data)
-                return str(filepath.relative_to(self.base_output_dir))
+                logger.debug(f"{url} returned {response.status}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
         except Exception as e:
             logger.error(f"Error downloading {url}: {e}")
             return None
 
+    async def _save_response(
+        self, response: aiohttp.ClientResponse, url: str, cached: Optional[Dict[str, str]],
+        relative_path: str
+    ) -> Optional[str]:
+        if response.status == 304 and cached:
+            if cached['hash'] in self.image_hashes:
+                return None
+            self.image_hashes.add(cached['hash'])
+            return cached['path']
+        if response.status != 200:
+            return None
+        image_data = await response.read()
+        image_hash = hashlib.sha256(image_data).hexdigest()
+        if image_hash in self.image_hashes:
+            return None
+        self.image_hashes.add(image_hash)
+        etag = response.headers.get('ETag')
+        filepath = self.base_output_dir / relative_path
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        async with aiofiles.open(filepath, 'wb') as f:
+            await f.write(image_data)
+        if self.etag_manifest and etag:
+            self.etags[url] = {'etag': etag, 'path': relative_path, 'hash': image_hash}
+        return relative_path
+
+    def _relative_path(self, url: str, manufacturer: str, model: str, year: int, index: int) -> str:
+        ext = 'jpg'
+        if '.png' in url.lower(): ext = 'png'
+        elif '.webp' in url.lower(): ext = 'webp'
+        safe_name = self._sanitize_filename(f"{manufacturer}_{model}_{year}")
+        filename = f"{safe_name}_{index:03d}.{ext}"
+        return str(Path(manufacturer) / model / str(year) / filename)
+
+    @staticmethod
+    def _retry_delay(response: aiohttp.ClientResponse, attempt: int) -> Optional[float]:
+        # Exponential backoff, but never sooner than the server's Retry-After
+        # (only the delta-seconds form is honoured); None when the server
+        # asks for more than MAX_RETRY_DELAY
+        try:
+            retry_after = float(response.headers.get('Retry-After', 0))
+        except ValueError:
+            retry_after = 0
+        if retry_after > MAX_RETRY_DELAY:
+            return None
+        return min(max(retry_after, 2 ** attempt), MAX_RETRY_DELAY)
+
     def _sanitize_filename(self, text: str) -> str:
         return re.sub(r'[^\w\s-]', '', text).strip().replace(' ', '_')
@@ -0,0 +1,73 @@
+"""On-disk cache of image HEAD metadata for content-addressed image URLs."""
+import asyncio
+import json
+from pathlib import Path
+from typing import Dict, Optional
+import aiohttp
+import aiofiles
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_FILE = '.cache/image_heads.json'
+
+
+class ImageHeadCache:
+    """
+    Verifies image URLs with HEAD requests and remembers the good ones.
+
+    Contentful (images.ctfassets.net) URLs embed the asset hash, so a URL
+    that answered once keeps answering with the same bytes and entries
+    never expire. Failed URLs are not cached and are retried next run.
+    """
+
+    def __init__(self, cache_file: str = DEFAULT_CACHE_FILE):
+        self.cache_file = Path(cache_file)
+        self.entries: Dict[str, Dict] = {}
+        self._dirty = False
+        if self.cache_file.exists():
+            try:
+                self.entries = json.loads(self.cache_file.read_text(encoding='utf-8'))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable image cache {self.cache_file}: {e}")
+
+    async def fetch_head(self, url: str, session: aiohttp.ClientSession) -> Optional[Dict]:
+        """
+        Get HEAD metadata for an image URL, from the cache when known.
+
+        Args:
+            url: Image URL
+            session: aiohttp session used on a cache miss
+
+        Returns:
+            Dict with etag, content_length and content_type, or None if the
+            URL did not answer 200
+        """
+        if url in self.entries:
+            return self.entries[url]
+        try:
+            async with session.head(url, allow_redirects=True, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                if response.status != 200:
+                    logger.debug(f"HEAD {url} returned {response.status}")
+                    return None
+                content_length = response.headers.get('Content-Length')
+                entry = {
+                    'etag': response.headers.get('ETag'),
+                    'content_length': int(content_length) if content_length else None,
+                    'content_type': response.headers.get('Content-Type'),
+                }
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug(f"HEAD {url} failed: {e}")
+            return None
+        self.entries[url] = entry
+        self._dirty = True
+        return entry
+
+    async def save(self) -> None:
+        """Write the cache back to disk if new URLs were verified."""
+        if not self._dirty:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        async with aiofiles.open(self.cache_file, 'w', encoding='utf-8') as f:
+            await f.write(json.dumps(self.entries, indent=2))
+        self._dirty = False
@@ -4,5 +4,6 @@ Data and image extraction components.
 
 from src.extractors.data_extractor import DataExtractor
 from src.extractors.image_extractor import ImageExtractor
+from src.extractors.static_page import StaticPage
 
-__all__ = ['DataExtractor', 'ImageExtractor']
+__all__ = ['DataExtractor', 'ImageExtractor', 'StaticPage']
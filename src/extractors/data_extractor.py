@@ -8,6 +8,7 @@ import asyncio
 import re
 from typing import Dict, Any, List, Optional
 from playwright.async_api import Page
+from src.extractors.static_page import StaticElement
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -406,21 +407,25 @@ class DataExtractor:
                     term_text = await term.inner_text()
                     if term_text and len(term_text.strip()) > 3:
                         # Find following p elements (accordion content)
-                        # Use evaluate to find next sibling p elements
-                        content_texts = await term.evaluate('''
-                            (el) => {
-                                const contents = [];
-                                let next = el.nextElementSibling;
-                                while (next && (next.tagName === 'P' || next.tagName === 'DD')) {
-                                    const text = next.innerText?.trim();
-                                    if (text && text.length > 10) {
-                                        contents.push(text);
+                        if isinstance(term, StaticElement):
+                            # Server-rendered HTML has no JavaScript to evaluate
+                            content_texts = term.following_sibling_texts(('p', 'dd'), min_length=10)
+                        else:
+                            # Use evaluate to find next sibling p elements
+                            content_texts = await term.evaluate('''
+                                (el) => {
+                                    const contents = [];
+                                    let next = el.nextElementSibling;
+                                    while (next && (next.tagName === 'P' || next.tagName === 'DD')) {
+                                        const text = next.innerText?.trim();
+                                        if (text && text.length > 10) {
+                                            contents.push(text);
+                                        }
+                                        next = next.nextElementSibling;
                                     }
-                                    next = next.nextElementSibling;
+                                    return contents;
                                 }
-                                return contents;
-                            }
-                        ''')
+                            ''')
                         
                         if content_texts:
                             # Combine term and content
@@ -438,18 +443,23 @@ class DataExtractor:
                     text = await p.inner_text()
                     if text and len(text.strip()) > 50:
                         # Check if it's near an accordion term
-                        parent_section = await p.evaluate('''
-                            (el) => {
-                                let parent = el.parentElement;
-                                while (parent && parent !== document.body) {
-                                    if (parent.querySelector('dt.term, dt[data-js-accordiontoggle-trigger]')) {
-                                        return true;
+                        if isinstance(p, StaticElement):
+                            parent_section = p.has_ancestor_containing(
+                                'dt.term, dt[data-js-accordiontoggle-trigger]'
+                            )
+                        else:
+                            parent_section = await p.evaluate('''
+                                (el) => {
+                                    let parent = el.parentElement;
+                                    while (parent && parent !== document.body) {
+                                        if (parent.querySelector('dt.term, dt[data-js-accordiontoggle-trigger]')) {
+                                            return true;
+                                        }
+                                        parent = parent.parentElement;
                                     }
-                                    parent = parent.parentElement;
+                                    return false;
                                 }
-                                return false;
-                            }
-                        ''')
+                            ''')
                         if parent_section and text.strip() not in accordion_texts:
                             accordion_texts.append(text.strip())
             except Exception as e:
@@ -0,0 +1,109 @@
+"""
+Ducati bike page selectors shared by the extraction scripts.
+
+Selectors for the content sections and hotspot tooltips of a Ducati bike
+page, the script that reads the tooltips, and the route handlers (built
+by one factory) that block requests the scrapers do not use.
+"""
+
+from typing import FrozenSet, Tuple
+from urllib.parse import urlparse
+
+# Resources the extraction never needs: images are downloaded separately
+# over aiohttp. Stylesheets stay, the tooltip visibility check depends on
+# them.
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+
+# Requests aborted by the scrapers that read images from the rendered page:
+# nothing they read depends on them. Images and stylesheets stay (image URLs
+# and sizes come from the rendered DOM) and so does OneTrust (it serves the
+# cookie banner).
+HEAVY_RESOURCE_TYPES = frozenset({'font', 'media', 'websocket'})
+BLOCKED_HOSTS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'facebook.net',
+    'facebook.com',
+    'hotjar.com',
+    'clarity.ms',
+    'linkedin.com',
+    'tiktok.com',
+)
+
+# Content the extraction reads; waited for instead of a fixed post-load sleep
+CONTENT_SELECTOR = 'div.content'
+HOTSPOT_BUTTON_SELECTOR = '[class*="hotspot__button"]'
+TOOLTIP_SELECTOR = '[data-js-tip]'
+
+# Clicks every hotspot in the page and reads the tooltip it opens, in one
+# evaluate call instead of several driver round-trips per hotspot
+TOOLTIPS_JS = """
+async ({buttonSelector, tipSelector, timeoutMs}) => {
+    const visibleTipText = () => {
+        const tip = document.querySelector(tipSelector);
+        const visible = tip && (tip.offsetWidth || tip.offsetHeight || tip.getClientRects().length);
+        return visible ? tip.innerText.trim() : '';
+    };
+    // Poll until a tooltip other than the previous one is shown
+    const waitForTip = async (previous) => {
+        const deadline = performance.now() + timeoutMs;
+        while (performance.now() < deadline) {
+            const text = visibleTipText();
+            if (text && text !== previous) {
+                return text;
+            }
+            await new Promise(resolve => setTimeout(resolve, 50));
+        }
+        return visibleTipText();
+    };
+    const buttons = [...document.querySelectorAll(buttonSelector)];
+    const tooltips = [];
+    let previous = '';
+    for (const [idx, button] of buttons.entries()) {
+        try {
+            button.click();
+            const text = await waitForTip(previous);
+            if (text) {
+                tooltips.push({hotspot_number: idx + 1, content: text});
+                previous = text;
+            }
+        } catch (e) {
+            // Skip hotspots that fail to open
+        }
+    }
+    return {buttons: buttons.length, tooltips};
+}
+"""
+
+
+def _route_blocker(resource_types: FrozenSet[str], hosts: Tuple[str, ...] = ()):
+    """
+    Build a Playwright route handler that aborts some requests.
+
+    Args:
+        resource_types: Resource types to abort
+        hosts: Hosts (and their subdomains) whose requests are aborted
+
+    Returns:
+        Handler for page.route()/context.route() that continues every other request
+    """
+    async def handler(route):
+        request = route.request
+        if request.resource_type in resource_types:
+            await route.abort()
+            return
+        if hosts:
+            host = urlparse(request.url).hostname or ''
+            if any(host == blocked or host.endswith('.' + blocked) for blocked in hosts):
+                await route.abort()
+                return
+        await route.continue_()
+    return handler
+
+
+# Image/media/font blocker for the scripts that download images over aiohttp
+block_unneeded_resources = _route_blocker(BLOCKED_RESOURCE_TYPES)
+# Font/media and analytics/tracking blocker for the scrapers that read images
+# from the rendered page
+block_heavy_requests = _route_blocker(HEAVY_RESOURCE_TYPES, BLOCKED_HOSTS)
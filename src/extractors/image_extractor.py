@@ -40,7 +40,8 @@ class ImageExtractor:
         self,
         page: Page,
         model: str,
-        year: int
+        year: int,
+        lazy_load_wait: int = 2000
     ) -> List[Dict[str, Any]]:
         """
         Extract all relevant images from page.
@@ -49,6 +50,8 @@ class ImageExtractor:
             page: Playwright page object
             model: Bike model name
             year: Model year
+            lazy_load_wait: Milliseconds to wait for lazy-loaded images first
+                (pass 0 if the caller already waited)
 
         Returns:
             List of image dicts with url, alt, type, dimensions
@@ -56,7 +59,8 @@ class ImageExtractor:
         images = []
 
         # Wait for lazy-loaded images
-        await page.wait_for_timeout(2000)
+        if lazy_load_wait:
+            await page.wait_for_timeout(lazy_load_wait)
         
         # Expand accordions to reveal hidden images
         await self._expand_accordions(page)
@@ -0,0 +1,96 @@
+"""
+Static page adapter for motorcycle OEM web-crawler.
+
+Wraps server-rendered HTML in the subset of the Playwright Page/ElementHandle
+API used by the extractors, so pages that need no JavaScript can be parsed
+without launching a browser.
+"""
+
+from typing import List, Optional, Tuple
+from bs4 import BeautifulSoup, Tag
+
+
+class StaticElement:
+    """
+    Read-only stand-in for a Playwright ElementHandle.
+    """
+
+    def __init__(self, tag: Tag):
+        """Initialize from a parsed BeautifulSoup tag."""
+        self._tag = tag
+
+    async def query_selector(self, selector: str) -> Optional["StaticElement"]:
+        """Return the first descendant matching a CSS selector."""
+        tag = self._tag.select_one(selector)
+        return StaticElement(tag) if tag else None
+
+    async def query_selector_all(self, selector: str) -> List["StaticElement"]:
+        """Return all descendants matching a CSS selector."""
+        return [StaticElement(tag) for tag in self._tag.select(selector)]
+
+    async def inner_text(self) -> str:
+        """Return the element text with one line per text node."""
+        return self._tag.get_text('\n', strip=True)
+
+    async def get_attribute(self, name: str) -> Optional[str]:
+        """Return an attribute value (multi-valued attributes are joined)."""
+        value = self._tag.get(name)
+        if isinstance(value, list):
+            return ' '.join(value)
+        return value
+
+    def following_sibling_texts(self, names: Tuple[str, ...], min_length: int = 0) -> List[str]:
+        """
+        Return the text of the run of next siblings with the given tag names.
+
+        Static counterpart of the sibling walk DataExtractor runs through
+        ElementHandle.evaluate() on live pages; texts no longer than
+        min_length are skipped but do not end the run.
+        """
+        texts = []
+        sibling = self._tag.find_next_sibling()
+        while sibling is not None and sibling.name in names:
+            text = sibling.get_text('\n', strip=True)
+            if len(text) > min_length:
+                texts.append(text)
+            sibling = sibling.find_next_sibling()
+        return texts
+
+    def has_ancestor_containing(self, selector: str) -> bool:
+        """Check whether an ancestor below <body> contains an element matching selector."""
+        for parent in self._tag.parents:
+            if parent.name in ('body', '[document]'):
+                break
+            if parent.select_one(selector) is not None:
+                return True
+        return False
+
+
+class StaticPage(StaticElement):
+    """
+    Read-only stand-in for a Playwright Page built from an HTML string.
+    """
+
+    def __init__(self, html: str, url: str = ''):
+        """
+        Parse HTML for static extraction.
+
+        Args:
+            html: Raw page HTML
+            url: URL the HTML was fetched from
+        """
+        soup = BeautifulSoup(html, 'lxml')
+        # Script/style text would otherwise leak into inner_text()
+        for tag in soup(['script', 'style', 'noscript', 'template']):
+            tag.decompose()
+        super().__init__(soup)
+        self.url = url
+
+    def has_any(self, selector: str) -> bool:
+        """Check whether any element matches a CSS selector."""
+        return self._tag.select_one(selector) is not None
+
+    async def inner_text(self, selector: str = 'body') -> str:
+        """Return the text of the first element matching selector (page-style API)."""
+        tag = self._tag.select_one(selector)
+        return tag.get_text('\n', strip=True) if tag else ''
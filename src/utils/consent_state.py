@@ -0,0 +1,20 @@
+"""
+Saved cookie-consent state shared by the Ducati scraping scripts.
+
+Cookies/local storage are saved after the banner is accepted; consent is
+domain-wide, so later runs start from it and skip the banner entirely.
+"""
+
+import time
+from pathlib import Path
+
+STATE_FILE = Path('.cache/ducati_state.json')
+STATE_TTL = 7 * 24 * 60 * 60  # seconds
+
+
+def state_is_fresh() -> bool:
+    """Check whether saved consent state exists and is younger than STATE_TTL."""
+    try:
+        return time.time() - STATE_FILE.stat().st_mtime < STATE_TTL
+    except FileNotFoundError:
+        return False
@@ -0,0 +1,57 @@
+"""Regression tests for the Cursor browser snapshot parser."""
+from pathlib import Path
+
+from extract_from_cursor_browser import extract_specifications_from_text, parse_snapshot_file
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'cursor_snapshot.log'
+
+
+def test_parse_snapshot_header():
+    data = parse_snapshot_file(FIXTURE)
+    assert data['url'] == 'https://www.ducati.com/ww/en/bikes/multistrada/multistrada-v4-rally'
+    assert data['title'] == 'Multistrada V4 Rally - Ducati'
+
+
+def test_parse_snapshot_fields():
+    data = parse_snapshot_file(FIXTURE)
+    assert data['images'] == ['Image ref: ref-hero1', 'Image ref: ref-gal2']
+    # A link's name is the name field on the line after its role
+    assert data['links'] == ['Discover the range', 'Book a test ride']
+    # Every name field is text, including one on a link's role line and one
+    # spanned by an image match
+    assert data['text_content'] == [
+        'Discover the range',
+        'Multistrada V4 Rally',
+        'Inline link label',
+        'Book a test ride',
+        'Gallery picture',
+        'Radar system includes adaptive cruise control as standard.',
+    ]
+
+
+def test_spec_values():
+    specs = extract_specifications_from_text(['170 hp at 10,750 rpm', '121 Nm', '1,158 cc', '240 km/h'])
+    assert specs['power'] == '170'
+    assert specs['torque'] == '121'
+    assert specs['displacement'] == '1,158'
+    assert specs['top_speed'] == '240'
+    assert 'weight' not in specs
+
+
+def test_kgm_torque_is_not_a_weight():
+    # Separate per-spec searches also took "12.6 kgm" as the weight
+    specs = extract_specifications_from_text(['12.6 kgm', '230 kg'])
+    assert specs['torque'] == '12.6'
+    assert specs['weight'] == '230'
+
+
+def test_spec_keywords():
+    specs = extract_specifications_from_text(['Engine: V4 Granturismo\nBrakes: Brembo Stylema'])
+    assert specs['engine'] == 'V4 Granturismo'
+    assert specs['brakes'] == 'Brembo Stylema'
+
+
+def test_trailing_keyword_without_value_is_ignored():
+    # Separate per-keyword searches stored '' here, replacing the 170 kW value
+    specs = extract_specifications_from_text(['170 kW', 'Power  '])
+    assert specs['power'] == '170'
@@ -0,0 +1,102 @@
+"""Unit tests for the image downloader's conditional requests and retries."""
+import json
+
+import pytest
+from src.downloaders.image_downloader import ImageDownloader
+
+URL = 'https://images.example.com/abc/hero.jpg'
+BODY = b'image bytes'
+
+
+class StubResponse:
+    def __init__(self, status, body=b'', headers=None):
+        self.status = status
+        self._body = body
+        self.headers = headers or {}
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class StubSession:
+    """Answers every GET with the next queued response and records request headers."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def images_dir(tmp_path):
+    path = tmp_path / 'Ducati' / 'Rally' / '2024' / 'Ducati_Rally_2024_000.jpg'
+    path.parent.mkdir(parents=True)
+    path.write_bytes(BODY)
+    manifest = tmp_path / '.etags.json'
+    manifest.write_text(json.dumps({
+        URL: {'etag': '"v1"', 'path': 'Ducati/Rally/2024/Ducati_Rally_2024_000.jpg', 'hash': 'h1'},
+    }))
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_not_modified_returns_cached_path(images_dir):
+    downloader = ImageDownloader(str(images_dir), etag_manifest=str(images_dir / '.etags.json'))
+    session = StubSession(StubResponse(304))
+    path = await downloader.download_image(URL, 'Ducati', 'Rally', 2024, 0, session)
+    assert path == 'Ducati/Rally/2024/Ducati_Rally_2024_000.jpg'
+    assert session.requests == [{'If-None-Match': '"v1"'}]
+
+
+@pytest.mark.asyncio
+async def test_cached_path_for_other_index_is_downloaded_again(images_dir):
+    downloader = ImageDownloader(str(images_dir), etag_manifest=str(images_dir / '.etags.json'))
+    session = StubSession(StubResponse(200, BODY, {'ETag': '"v1"'}))
+    path = await downloader.download_image(URL, 'Ducati', 'Rally', 2024, 3, session)
+    assert path == 'Ducati/Rally/2024/Ducati_Rally_2024_003.jpg'
+    # No conditional request, so the server cannot answer 304 for the old name
+    assert session.requests == [{}]
+    assert (images_dir / path).read_bytes() == BODY
+    assert downloader.etags[URL]['path'] == path
+
+
+@pytest.mark.asyncio
+async def test_long_retry_after_gives_up(tmp_path, monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr('src.downloaders.image_downloader.asyncio.sleep', fake_sleep)
+    downloader = ImageDownloader(str(tmp_path))
+    session = StubSession(StubResponse(429, headers={'Retry-After': '3600'}))
+    assert await downloader.download_image(URL, 'Ducati', 'Rally', 2024, 0, session) is None
+    assert sleeps == []
+    assert len(session.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_waits_for_retry_after(tmp_path, monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr('src.downloaders.image_downloader.asyncio.sleep', fake_sleep)
+    downloader = ImageDownloader(str(tmp_path))
+    session = StubSession(
+        StubResponse(503, headers={'Retry-After': '5'}),
+        StubResponse(200, BODY),
+    )
+    path = await downloader.download_image(URL, 'Ducati', 'Rally', 2024, 0, session)
+    assert path == 'Ducati/Rally/2024/Ducati_Rally_2024_000.jpg'
+    assert sleeps == [5.0]
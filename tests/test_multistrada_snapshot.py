@@ -0,0 +1,58 @@
+"""Regression tests for the Multistrada snapshot URL and text extraction."""
+from pathlib import Path
+
+import pytest
+from extract_multistrada_page import extract_text_content, extract_urls_from_snapshot
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'multistrada_snapshot.log'
+BASE_URL = 'https://www.ducati.com/ww/en/bikes/multistrada/multistrada-v4-rally'
+
+
+@pytest.fixture
+def content():
+    return FIXTURE.read_bytes()
+
+
+def test_images_in_page_order(content):
+    urls = extract_urls_from_snapshot(content, BASE_URL)
+    assert urls['images'] == [
+        'https://images.ctfassets.net/x7j9/hero/MTS-rally-hero.jpg',
+        'https://cdn.example.com/bg/rally-bg.png',
+    ]
+
+
+def test_css_url_stops_at_space_or_paren(content):
+    # The old per-source passes also took url() values containing spaces or
+    # parentheses ('rally bg (2).png'); a url() value now ends at the first
+    # quote, paren or whitespace
+    urls = extract_urls_from_snapshot(content, BASE_URL)
+    assert not any('rally bg' in url for url in urls['images'])
+
+
+def test_video_posters(content):
+    urls = extract_urls_from_snapshot(content, BASE_URL)
+    assert urls['video_posters'] == ['https://images.ctfassets.net/x7j9/poster/MTS-rally-video.jpg']
+
+
+def test_links(content):
+    urls = extract_urls_from_snapshot(content, BASE_URL)
+    # Only ducati.com URLs that are not images or posters
+    assert urls['links'] == [
+        BASE_URL,
+        'https://www.ducati.com/ww/en/bikes/multistrada',
+    ]
+
+
+def test_text_and_specs(content):
+    data = extract_text_content(content)
+    assert data['url'] == BASE_URL
+    assert data['title'] == 'Multistrada V4 Rally | Ducati'
+    assert data['all_text'][0] == 'Multistrada V4 Rally'
+    assert 'Main menu' not in data['all_text']
+    assert data['specifications'] == {
+        'power': '170 hp',
+        'torque': '121 Nm',
+        'weight': '240 kg',
+        'displacement': '1158 cc',
+    }
+    assert data['features'] == ['Radar system includes adaptive cruise control as standard']
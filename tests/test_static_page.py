@@ -0,0 +1,79 @@
+"""Unit tests for the static page adapter."""
+from pathlib import Path
+
+import pytest
+from src.extractors.data_extractor import DataExtractor
+from src.extractors.static_page import StaticElement, StaticPage
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'static_page.html'
+
+
+@pytest.fixture
+def page():
+    return StaticPage(FIXTURE.read_text(encoding='utf-8'), 'https://example.com/bikes/multistrada-v4-rally')
+
+
+def test_has_any(page):
+    assert page.has_any('table.specifications')
+    assert page.has_any('dl.list, dt.term')
+    assert not page.has_any('div.d-table-responsive')
+
+
+@pytest.mark.asyncio
+async def test_query_selector(page):
+    table = await page.query_selector('table.specifications')
+    assert isinstance(table, StaticElement)
+    assert await page.query_selector('table.missing') is None
+    rows = await table.query_selector_all('tr')
+    assert len(rows) == 2
+    assert await (await rows[1].query_selector('td')).inner_text() == '170 hp'
+
+
+@pytest.mark.asyncio
+async def test_inner_text_skips_scripts_and_styles(page):
+    text = await page.inner_text()
+    assert 'Displacement' in text
+    assert 'dataLayer' not in text
+    assert 'display: none' not in text
+    assert 'Enable JavaScript' not in text
+    assert await page.inner_text('.missing') == ''
+
+
+@pytest.mark.asyncio
+async def test_get_attribute(page):
+    img = await page.query_selector('img')
+    assert await img.get_attribute('src') == '/images/hero.jpg'
+    # Multi-valued attributes come back as one string, like the DOM
+    assert await img.get_attribute('class') == 'hero primary'
+    assert await img.get_attribute('data-missing') is None
+
+
+@pytest.mark.asyncio
+async def test_following_sibling_texts(page):
+    comfort, electronics = await page.query_selector_all('dt.term')
+    assert comfort.following_sibling_texts(('p', 'dd'), min_length=10) == [
+        'Adjustable seat height and a larger windscreen for long days.',
+        'Heated grips come as standard on every version.',
+    ]
+    assert electronics.following_sibling_texts(('p', 'dd')) == [
+        'Radar-assisted adaptive cruise control and blind spot detection.',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_has_ancestor_containing(page):
+    selector = 'dt.term, dt[data-js-accordiontoggle-trigger]'
+    accordion_p = await page.query_selector('section.accordion p')
+    standalone_p = await page.query_selector('p.standalone')
+    assert accordion_p.has_ancestor_containing(selector)
+    # <body> itself is not checked, matching the JavaScript walk
+    assert not standalone_p.has_ancestor_containing(selector)
+
+
+@pytest.mark.asyncio
+async def test_description_includes_accordion_content(page):
+    description = await DataExtractor().extract_description(page)
+    assert 'Comfort\nAdjustable seat height' in description
+    assert 'Heated grips come as standard' in description
+    assert 'Electronics\nRadar-assisted adaptive cruise control' in description
+    assert 'outside every accordion' not in description